@@ -0,0 +1,38 @@
+"""
+Pemilihan backend detektor; modul backend hanya diimport saat dibutuhkan
+
+Backend Haar tidak pernah mengimport MediaPipe, sehingga worker berumur pendek
+yang memakai Haar tidak membayar waktu import MediaPipe.
+"""
+import importlib
+import time
+
+BACKENDS = ('haar', 'mediapipe', 'mediapipe-simple')
+
+# Modul dan kelas detektor untuk setiap backend
+_BACKEND_CLASSES = {
+    'haar': ('face_detection_opencv', 'SimpleExpressionDetector'),
+    'mediapipe': ('main', 'FaceExpressionDetector'),
+    'mediapipe-simple': ('main_simple', 'SimpleFaceExpressionDetector'),
+}
+
+
+def create_detector(backend='haar', timings=None, **options):
+    """Buat detektor untuk backend yang dipilih; `options` diteruskan ke konstruktor
+
+    Jika `timings` berupa dict, waktu import modul backend dan waktu
+    inisialisasi detektor (detik) dicatat ke dalamnya.
+    """
+    if backend not in _BACKEND_CLASSES:
+        raise ValueError(f"Backend tidak dikenal: {backend} (pilihan: {', '.join(BACKENDS)})")
+    module_name, class_name = _BACKEND_CLASSES[backend]
+
+    start = time.perf_counter()
+    detector_class = getattr(importlib.import_module(module_name), class_name)
+    imported = time.perf_counter()
+    detector = detector_class(**options)
+
+    if timings is not None:
+        timings['import_seconds'] = imported - start
+        timings['init_seconds'] = time.perf_counter() - imported
+    return detector
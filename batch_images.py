@@ -0,0 +1,132 @@
+"""
+Pemrosesan banyak gambar secara paralel dengan process pool
+
+Setiap worker membuat detektornya sendiri (FaceMesh atau Haar Cascade) satu kali
+di initializer, lalu gambar dibagi ke semua core. Hasil dikembalikan sesuai
+urutan input dan ditulis ke satu file JSONL/CSV.
+
+Contoh:
+    python batch_images.py foto/ -o label.jsonl --backend mediapipe --workers 8
+    python batch_images.py "arsip/**/*.jpg" -o label.csv
+    python batch_images.py foto/ -o label.jsonl --cache .landmark_cache
+"""
+import argparse
+import glob
+import os
+import time
+from multiprocessing import Pool
+
+import cv2
+
+from backends import BACKENDS, create_detector
+from config import DEFAULT_BACKEND
+from result_writer import ResultWriter
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+# Detektor milik proses worker (dibuat oleh _init_worker)
+_detector = None
+
+
+def _init_worker(backend, options, cache_dir=None):
+    global _detector
+    # Satu thread OpenCV per worker agar tidak berebut core dengan worker lain
+    cv2.setNumThreads(1)
+    if cache_dir:
+        # Setiap worker punya LRU sendiri; direktori cache di disk dipakai bersama
+        from landmark_cache import LandmarkCache
+        options = dict(options, cache=LandmarkCache(cache_dir))
+    _detector = create_detector(backend, **options)
+
+
+def _process_path(path):
+    image = cv2.imread(path)
+    if image is None:
+        return path, None
+
+    # Landmark MediaPipe tidak perlu dikirim balik ke proses utama
+    faces = _detector.detect(image)
+    for face in faces:
+        face.landmarks = None
+    return path, faces
+
+
+def collect_images(pattern):
+    """Daftar gambar dari direktori (rekursif) atau pola glob, terurut"""
+    if os.path.isdir(pattern):
+        paths = []
+        for root, _, files in os.walk(pattern):
+            paths.extend(os.path.join(root, name) for name in files
+                         if name.lower().endswith(IMAGE_EXTENSIONS))
+        return sorted(paths)
+    return sorted(glob.glob(pattern, recursive=True))
+
+
+def iter_images(paths, backend='haar', workers=None, chunksize=16, max_faces=None, cache_dir=None):
+    """Hasil (path, faces) per gambar sesuai urutan input; faces None jika gambar tidak terbaca"""
+    # Gambar tidak berurutan, jadi FaceMesh dijalankan dalam mode gambar statis
+    options = {} if backend == 'haar' else {'static_image_mode': True}
+    if max_faces and backend != 'haar':
+        options['max_num_faces'] = max_faces
+
+    if cache_dir and backend == 'haar':
+        raise ValueError("Cache landmark hanya untuk backend MediaPipe")
+
+    with Pool(workers, initializer=_init_worker, initargs=(backend, options, cache_dir)) as pool:
+        yield from pool.imap(_process_path, paths, chunksize)
+
+
+def process_images(paths, output_path, backend='haar', workers=None, fmt=None, chunksize=16,
+                   max_faces=None, cache_dir=None):
+    """Proses daftar gambar dengan process pool; kembalikan statistik throughput"""
+    unreadable = 0
+    start = time.perf_counter()
+
+    with ResultWriter(output_path, fmt) as writer:
+        for path, faces in iter_images(paths, backend, workers, chunksize, max_faces, cache_dir):
+            if faces is None:
+                unreadable += 1
+            writer.write(faces or [], path=path, readable=faces is not None)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'images': len(paths),
+        'unreadable': unreadable,
+        'seconds': elapsed,
+        'images_per_second': len(paths) / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deteksi ekspresi untuk banyak gambar secara paralel")
+    parser.add_argument('input', help="Direktori gambar atau pola glob (mis. 'foto/**/*.jpg')")
+    parser.add_argument('-o', '--output', required=True, help="File hasil (.jsonl atau .csv)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help="Format output (default: dari ekstensi)")
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument('--workers', type=int, help="Jumlah proses worker (default: jumlah CPU)")
+    parser.add_argument('--chunksize', type=int, default=16, help="Jumlah gambar per tugas worker")
+    parser.add_argument('--max-faces', type=int,
+                        help="MediaPipe: jumlah wajah maksimum per gambar (default: MEDIAPIPE_CONFIG)")
+    parser.add_argument('--cache', metavar='DIR',
+                        help="MediaPipe: cache landmark per isi gambar (run ulang tanpa Face Mesh)")
+    args = parser.parse_args()
+
+    if args.cache and args.backend == 'haar':
+        parser.error("--cache hanya untuk backend MediaPipe")
+
+    paths = collect_images(args.input)
+    if not paths:
+        print(f"Error: Tidak ada gambar ditemukan di {args.input}")
+        return
+
+    print(f"Memproses {len(paths)} gambar dengan backend {args.backend}...")
+    stats = process_images(paths, args.output, args.backend, args.workers,
+                           args.format, args.chunksize, args.max_faces, args.cache)
+
+    print(f"Selesai: {stats['images']} gambar dalam {stats['seconds']:.2f} s "
+          f"({stats['images_per_second']:.1f} gambar/s, {stats['unreadable']} tidak terbaca) "
+          f"-> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
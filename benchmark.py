@@ -0,0 +1,189 @@
+"""
+Benchmark tahap demi tahap untuk ketiga detektor
+
+Semua backend dijalankan tanpa GUI pada frame yang sama (video rekaman atau
+video sintetis). Setiap backend berjalan di proses terpisah sehingga peak RSS
+dan waktu import/inisialisasi terukur sendiri-sendiri. Hasilnya berupa laporan
+JSON: persentil p50/p95/p99 per tahap, end-to-end FPS, waktu import dan
+inisialisasi backend, serta peak RSS.
+
+Contoh:
+    python benchmark.py --video rekaman.mp4 --frames 300 -o report.json
+    python benchmark.py --backends haar mediapipe
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from backends import BACKENDS, create_detector
+from config import WEBCAM_CONFIG
+from instrumentation import StageTimer, latency_summary
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size proses ini (MB), None jika tidak tersedia"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def iter_synthetic_frames(count, width=None, height=None):
+    """Frame sintetis: wajah kartun yang bergerak di atas latar bergradien"""
+    width = width or WEBCAM_CONFIG['width']
+    height = height or WEBCAM_CONFIG['height']
+    background = np.tile(np.linspace(40, 200, width, dtype=np.uint8), (height, 1))
+    background = cv2.merge([background, background, background])
+
+    for i in range(count):
+        frame = background.copy()
+        cx = width // 2 + int(width * 0.2 * np.sin(i / 15))
+        cy = height // 2
+        size = min(width, height) // 4
+        cv2.ellipse(frame, (cx, cy), (size, int(size * 1.3)), 0, 0, 360, (150, 180, 220), -1)
+        for dx in (-size // 2, size // 2):
+            cv2.ellipse(frame, (cx + dx, cy - size // 3), (size // 6, size // 10), 0, 0, 360, (255, 255, 255), -1)
+            cv2.circle(frame, (cx + dx, cy - size // 3), size // 14, (40, 30, 20), -1)
+        cv2.ellipse(frame, (cx, cy + size // 2), (size // 3, size // 6), 0, 0, 180, (60, 40, 160), 4)
+        yield frame
+
+
+def synthetic_frames(count, width=None, height=None):
+    return list(iter_synthetic_frames(count, width, height))
+
+
+def iter_video_frames(video_path, count):
+    """Decode `count` frame dari video satu per satu (diulang dari awal jika video lebih pendek)"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Tidak dapat membuka video {video_path}")
+
+    try:
+        decoded = 0
+        while decoded < count:
+            ret, frame = cap.read()
+            if not ret:
+                if not decoded:
+                    break
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                continue
+            decoded += 1
+            yield frame
+    finally:
+        cap.release()
+
+
+def load_frames(video_path, count):
+    return list(iter_video_frames(video_path, count))
+
+
+def benchmark_backend(backend, video_path, frame_count, warmup):
+    """Jalankan satu backend (dipanggil di proses anak) dan kembalikan laporannya"""
+    timings = {}
+    detector = create_detector(backend, timings)
+
+    def frames(count):
+        # Frame di-decode satu per satu sehingga peak RSS tidak didominasi frame yang dimuat
+        return iter_video_frames(video_path, count) if video_path else iter_synthetic_frames(count)
+
+    timer = StageTimer()
+    detector.timer = timer
+
+    # Warm-up tidak ikut dihitung (graph MediaPipe lebih lambat di panggilan pertama)
+    for frame in frames(warmup):
+        detector.process_frame(frame)
+    timer.reset()
+
+    end_to_end = []
+    faces = 0
+    for frame in frames(frame_count):
+        t0 = time.perf_counter()
+        _, expression = detector.process_frame(frame)
+        end_to_end.append(time.perf_counter() - t0)
+        faces += expression != "Tidak Ada Wajah"
+    if not end_to_end:
+        raise IOError(f"Video {video_path} tidak berisi frame")
+    # FPS dari waktu pemrosesan saja, tanpa waktu decode
+    loop_seconds = sum(end_to_end)
+
+    return {
+        'import_seconds': round(timings['import_seconds'], 3),
+        'init_seconds': round(timings['init_seconds'], 3),
+        'frames': len(end_to_end),
+        'frames_with_face': faces,
+        'stages': timer.summary(),
+        'end_to_end': latency_summary(end_to_end),
+        'fps': round(len(end_to_end) / loop_seconds, 2) if loop_seconds > 0 else 0.0,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def run_benchmarks(backends, video_path=None, frame_count=300, warmup=10):
+    """Benchmark setiap backend di proses terpisah (spawn) agar RSS tidak saling tercampur"""
+    context = multiprocessing.get_context('spawn')
+    report = {
+        'meta': {
+            'video': video_path or 'synthetic',
+            'frames': frame_count,
+            'warmup': warmup,
+            'python': platform.python_version(),
+            'opencv': cv2.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform()
+        },
+        'backends': {}
+    }
+    for backend in backends:
+        with context.Pool(1) as pool:
+            report['backends'][backend] = pool.apply(
+                benchmark_backend, (backend, video_path, frame_count, warmup))
+    return report
+
+
+def print_report(report):
+    for backend, result in report['backends'].items():
+        rss = result['peak_rss_mb']
+        print(f"\n[{backend}] {result['fps']} FPS, import {result['import_seconds']} s, "
+              f"init {result['init_seconds']} s, "
+              f"peak RSS {rss if rss is not None else '-'} MB, "
+              f"wajah di {result['frames_with_face']}/{result['frames']} frame")
+        rows = list(result['stages'].items()) + [('end_to_end', result['end_to_end'])]
+        print(f"  {'tahap':<16}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, stats in rows:
+            if stats['count']:
+                print(f"  {name:<16}{stats['count']:>6}{stats['p50_ms']:>10.3f}"
+                      f"{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per tahap untuk semua detektor")
+    parser.add_argument('--video', help="Video rekaman (default: video sintetis)")
+    parser.add_argument('--frames', type=int, default=300, help="Jumlah frame yang diukur")
+    parser.add_argument('--warmup', type=int, default=10, help="Frame pemanasan yang tidak diukur")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('-o', '--output', help="Simpan laporan JSON ke file ini")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.backends, args.video, args.frames, args.warmup)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nLaporan disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Pool buffer numpy untuk tujuan konversi warna dan resize
+
+Setiap detektor memakai ulang buffer yang sama setiap frame (kunci: nama
+pemakaian, shape, dtype) alih-alih mengalokasikan array baru. Jumlah buffer
+dibatasi dengan LRU karena ukuran crop ROI bisa berubah-ubah.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+
+class BufferPool:
+    """Buffer yang dipakai ulang per (nama, shape, dtype), maksimal `max_buffers` buffer"""
+
+    def __init__(self, max_buffers=8):
+        self.max_buffers = max_buffers
+        self.buffers = OrderedDict()
+        self.allocations = 0
+
+    def get(self, shape, dtype=np.uint8, name=''):
+        """Buffer (writeable) untuk shape/dtype ini; isinya sisa pemakaian sebelumnya"""
+        key = (name, tuple(shape), np.dtype(dtype))
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = self.buffers[key] = np.empty(shape, dtype=dtype)
+            self.allocations += 1
+            if len(self.buffers) > self.max_buffers:
+                self.buffers.popitem(last=False)
+        else:
+            self.buffers.move_to_end(key)
+            # Buffer yang terakhir diserahkan ke MediaPipe ditandai read-only
+            buffer.flags.writeable = True
+        return buffer
+
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer in self.buffers.values())
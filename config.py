@@ -11,6 +11,23 @@ MEDIAPIPE_CONFIG = {
     'min_tracking_confidence': 0.5
 }
 
+# Konfigurasi Haar Cascade (face_detection_opencv.py)
+HAAR_CONFIG = {
+    'face_cascade': 'haarcascade_frontalface_default.xml',
+    'eye_cascade': 'haarcascade_eye.xml',
+    'smile_cascade': 'haarcascade_smile.xml',
+    'scale_factor': 1.1,
+    'min_neighbors': 4,
+    'min_face_size': None,    # (w, h) piksel frame penuh; None = ukuran jendela cascade
+    'max_face_size': None,    # (w, h) piksel frame penuh; None = tanpa batas
+    # Rasio downscale untuk deteksi wajah (1.0 = resolusi penuh). Kotak wajah
+    # diskalakan kembali, mata/senyum tetap dicari pada ROI resolusi penuh
+    'detection_scale': 1.0
+}
+
+# Backend default untuk semua entry point (run.py, video_processing.py, batch_images.py, ...)
+DEFAULT_BACKEND = 'mediapipe'
+
 # Face Landmark Indices (berdasarkan MediaPipe Face Mesh)
 LANDMARKS = {
     # Mata kiri (16 titik)
@@ -48,6 +65,31 @@ EXPRESSION_THRESHOLDS = {
     }
 }
 
+# Threshold yang disesuaikan untuk versi sederhana (main_simple.py)
+SIMPLE_EXPRESSION_THRESHOLDS = {
+    'HAPPY': {
+        'mouth_corner_threshold': -0.005,
+        'mouth_open_threshold': 0.015
+    },
+    'SAD': {
+        'mouth_corner_threshold': 0.005,
+        'eyebrow_height_threshold': 0.42
+    },
+    'ANGRY': {
+        'eyebrow_distance_threshold': 0.06,
+        'eyebrow_height_threshold': 0.43,
+        'eye_openness_threshold': 0.27
+    }
+}
+
+# Kode numerik ekspresi (hasil klasifikasi batch)
+EXPRESSION_CODES = {
+    'NEUTRAL': 0,
+    'HAPPY': 1,
+    'SAD': 2,
+    'ANGRY': 3
+}
+
 # Label ekspresi
 EXPRESSION_LABELS = {
     'NEUTRAL': 'Neutral',
@@ -78,5 +120,91 @@ FONT_CONFIG = {
 WEBCAM_CONFIG = {
     'width': 640,
     'height': 480,
-    'fps': 30
+    'fps': 30,
+    'show_performance': False  # Overlay FPS/latensi di jendela webcam
+}
+
+# Pengaturan kualitas adaptif (lihat quality_control.py)
+ADAPTIVE_QUALITY_CONFIG = {
+    'latency_budget_ms': 33,  # Anggaran latensi per frame (~30 fps)
+    'window': 15,             # Jumlah frame untuk rata-rata latensi
+    'restore_ratio': 0.6,     # Naikkan kualitas jika latensi < 60% anggaran
+    # Level kualitas dari penuh ke paling ringan; setiap level menambah satu degradasi
+    'levels': [
+        {'frame_interval': 1, 'refine_landmarks': True, 'input_scale': 1.0, 'draw_mesh': True},
+        {'frame_interval': 2, 'refine_landmarks': True, 'input_scale': 1.0, 'draw_mesh': True},
+        {'frame_interval': 2, 'refine_landmarks': False, 'input_scale': 1.0, 'draw_mesh': True},
+        {'frame_interval': 2, 'refine_landmarks': False, 'input_scale': 0.5, 'draw_mesh': True},
+        {'frame_interval': 3, 'refine_landmarks': False, 'input_scale': 0.5, 'draw_mesh': False},
+    ]
+}
+
+# Pengaturan tracking ROI untuk MediaPipe (lihat roi_tracking.py)
+ROI_TRACKING_CONFIG = {
+    'padding': 0.5,           # Tambahan di setiap sisi, relatif terhadap ukuran wajah
+    'resize_tolerance': 0.25, # Ukuran crop diubah jika ukuran wajah berubah > 25%
+    'max_input_size': 320,    # Sisi terpanjang crop setelah diperkecil (piksel)
+    'max_area_ratio': 0.8     # Di atas rasio luas ini lebih murah memproses frame penuh
+}
+
+# Cache landmark untuk pemrosesan ulang gambar yang sama (lihat landmark_cache.py)
+LANDMARK_CACHE_CONFIG = {
+    'directory': '.landmark_cache',
+    'max_memory_mb': 64,      # Batas LRU di memori per proses
+    'max_disk_mb': 1024,      # Batas ukuran direktori cache (None = tanpa batas)
+    'rescan_interval': 100    # Hitung ulang ukuran direktori setiap N penulisan (proses lain ikut menulis)
+}
+
+# Gerbang perubahan frame: inferensi dilewati jika frame hampir sama (lihat motion_gate.py)
+MOTION_GATE_CONFIG = {
+    'method': 'diff',         # 'diff' (selisih thumbnail) atau 'dhash' (perceptual hash)
+    'thumbnail_size': (32, 24),
+    'diff_threshold': 0.003,  # Rata-rata selisih absolut thumbnail (0-1)
+    'hash_threshold': 1,      # Jumlah bit dHash 64-bit yang berbeda (1 = hanya hash identik)
+    'refresh_interval': 30,   # Paksa inferensi penuh setiap N frame
+    'region_padding': 0.25    # Setelah ada wajah: bandingkan bbox wajah + padding (rasio ukuran bbox)
+}
+
+# Penulisan video beranotasi di thread terpisah (lihat video_writer.py)
+VIDEO_WRITER_CONFIG = {
+    'queue_size': 64,         # Frame yang boleh mengantre untuk di-encode
+    'block': False,           # False: frame dibuang saat antrean penuh (inferensi tidak pernah menunggu)
+    'fourcc': None,           # None = dari ekstensi file (.mp4 -> mp4v, .avi -> MJPG)
+    'pre_seconds': 1.0,       # Mode segmen: durasi sebelum perubahan ekspresi
+    'post_seconds': 2.0       # Mode segmen: durasi setelah perubahan ekspresi terakhir
+}
+
+# Pengaturan layanan HTTP inferensi lokal (lihat inference_server.py)
+SERVER_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8080,
+    'workers': 2,             # Jumlah instance detektor = request yang diproses bersamaan
+    'max_queue': 8,           # Request yang boleh menunggu detektor; selebihnya ditolak (503)
+    'queue_timeout': 5.0,     # Batas waktu menunggu detektor (detik)
+    'max_body_mb': 16,        # Ukuran body request maksimum
+    'latency_window': 1000    # Jumlah request terakhir untuk statistik latensi
+}
+
+# Pengaturan pool detektor yang sudah di-warm-up (lihat detector_pool.py)
+DETECTOR_POOL_CONFIG = {
+    'size': 2,                # Jumlah instance detektor
+    'warmup_frames': 3,       # Frame dummy per instance sebelum pool dipakai
+    'warmup_width': 640,      # Resolusi frame dummy (samakan dengan input yang diharapkan)
+    'warmup_height': 480,
+    'warmup_image': None,     # Opsional: gambar berwajah agar model landmark ikut di-warm-up
+    'acquire_timeout': 5.0,   # Batas waktu menunggu instance bebas (detik)
+    'max_failures': 3         # Instance diganti setelah sekian error berturut-turut
+}
+
+# Soak test (soak.py): stabilitas memori dan throughput jangka panjang
+SOAK_CONFIG = {
+    'frames': 100000,           # Total frame yang diproses
+    'warmup_frames': 200,       # Frame sebelum baseline memori diambil
+    'sample_interval': 1000,    # Ambil sampel RSS/tracemalloc setiap N frame
+    'loop_frames': 300,         # Jumlah frame video/sintetis yang diputar berulang
+    'max_rss_growth_mb': 50.0,  # Gagal jika RSS tumbuh lebih dari ini sejak baseline
+    'max_traced_growth_mb': 10.0,  # Gagal jika memori Python (tracemalloc) tumbuh lebih dari ini
+    'max_fps_drop': None,       # Opsional: gagal jika FPS akhir turun lebih dari rasio ini (mis. 0.25)
+    'top_sites': 10,            # Jumlah lokasi alokasi dengan pertumbuhan terbesar di laporan
+    'traceback_depth': 1        # Kedalaman traceback tracemalloc (lebih besar = lebih lambat)
 }
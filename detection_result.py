@@ -0,0 +1,46 @@
+"""
+Objek hasil deteksi per wajah untuk jalur inferensi tanpa render
+
+Detektor hanya mengisi angka (bbox, kode ekspresi, margin, fitur); label teks
+dan gambar dibuat oleh renderer saat frame memang akan ditampilkan.
+"""
+from config import EXPRESSION_CODES, EXPRESSION_LABELS
+
+# Nama ekspresi berdasarkan kodenya (index = kode)
+EXPRESSION_NAMES = sorted(EXPRESSION_CODES, key=EXPRESSION_CODES.get)
+
+
+class FaceResult:
+    """Hasil satu wajah: bbox piksel (x_min, y_min, x_max, y_max), kode ekspresi dan data pendukung"""
+
+    __slots__ = ('bbox', 'code', 'features', 'margins', 'landmarks', 'region', 'parts')
+
+    def __init__(self, bbox, code, features=None, margins=None, landmarks=None, region=None, parts=None):
+        self.bbox = bbox
+        self.code = code
+        self.features = features      # Fitur landmark (7,) atau None (Haar)
+        self.margins = margins        # Margin aturan Senang/Sedih/Marah (3,) atau None
+        self.landmarks = landmarks    # Landmark MediaPipe mentah (untuk digambar)
+        self.region = region          # Crop ROI tempat landmark dihitung, None = frame penuh
+        self.parts = parts            # Haar: {'eyes': [...], 'smiles': [...]}
+
+    @property
+    def name(self):
+        return EXPRESSION_NAMES[self.code]
+
+    @property
+    def label(self):
+        return EXPRESSION_LABELS[self.name]
+
+    @property
+    def margin(self):
+        """Jarak ke batas keputusan: margin aturan yang menang, atau jarak ke aturan terdekat untuk Neutral"""
+        if self.margins is None:
+            return None
+        if self.code == EXPRESSION_CODES['NEUTRAL']:
+            return -float(self.margins.max())
+        # Urutan margin mengikuti kode Senang (1), Sedih (2), Marah (3)
+        return float(self.margins[self.code - 1])
+
+    def __repr__(self):
+        return f'FaceResult(bbox={self.bbox}, expression={self.name})'
@@ -0,0 +1,197 @@
+"""
+Pool instance detektor yang dibuat dan di-warm-up di awal
+
+Membuat FaceMesh atau memuat cascade Haar itu mahal, dan panggilan pertama
+pada graph baru jauh lebih lambat dari kondisi stabil. Pool membuat N
+instance sekaligus dan menjalankan beberapa frame dummy (resolusi input yang
+diharapkan) pada setiap instance, sehingga request nyata pertama tidak
+membayar cold start. Instance dipinjam lewat `checkout()` dengan batas waktu
+tunggu; instance yang error berturut-turut diganti dengan instance baru yang
+dibuat di thread latar belakang (bukan di thread request), lalu instance lama
+ditutup.
+
+Contoh:
+    pool = DetectorPool('mediapipe', size=2, static_image_mode=True)
+    with pool.checkout() as detector:
+        faces = detector.detect(frame)
+    print(pool.stats())
+"""
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+from backends import create_detector
+from config import DETECTOR_POOL_CONFIG
+from instrumentation import latency_summary
+
+
+class PoolTimeout(Exception):
+    """Tidak ada instance bebas dalam batas waktu tunggu"""
+
+
+def warmup_frame(width, height, image_path=None):
+    """Frame dummy BGR berukuran input; dari `image_path` jika diberikan"""
+    if image_path:
+        image = cv2.imread(image_path)
+        if image is None:
+            raise IOError(f"Tidak dapat membaca gambar warm-up {image_path}")
+        return cv2.resize(image, (width, height))
+    # Noise abu-abu: graph dijalankan penuh tanpa bergantung isi gambar
+    rng = np.random.default_rng(0)
+    return rng.integers(96, 160, size=(height, width, 3), dtype=np.uint8)
+
+
+class DetectorPool:
+    """N detektor siap pakai dengan checkout/release, batas tunggu dan health tracking"""
+
+    def __init__(self, backend='haar', size=None, warmup_frames=None, warmup_size=None,
+                 warmup_image=None, acquire_timeout=None, max_failures=None, **detector_options):
+        config = DETECTOR_POOL_CONFIG
+        self.backend = backend
+        self.detector_options = detector_options
+        self.size = size or config['size']
+        self.warmup_frames = config['warmup_frames'] if warmup_frames is None else warmup_frames
+        width, height = warmup_size or (config['warmup_width'], config['warmup_height'])
+        self.warmup_image = warmup_frame(width, height, warmup_image or config['warmup_image'])
+        self.acquire_timeout = acquire_timeout or config['acquire_timeout']
+        self.max_failures = max_failures or config['max_failures']
+
+        self.available = queue.Queue()
+        self.lock = threading.Lock()
+        self.instances = {}
+        self.waits = deque(maxlen=1000)
+        self.created = 0
+        self.replaced = 0
+        self.replacing = 0
+        self.replace_failures = 0
+        self.timeouts = 0
+
+        start = time.perf_counter()
+        for _ in range(self.size):
+            self.available.put(self._create())
+        self.startup_seconds = time.perf_counter() - start
+
+    def _create(self):
+        """Buat dan warm-up satu instance; catat waktu inisialisasi dan warm-up"""
+        timings = {}
+        detector = create_detector(self.backend, timings, **self.detector_options)
+
+        warmup = []
+        for _ in range(self.warmup_frames):
+            start = time.perf_counter()
+            detector.detect(self.warmup_image)
+            warmup.append(time.perf_counter() - start)
+        # ROI dari frame dummy tidak boleh terbawa ke input nyata
+        if getattr(detector, 'roi_tracker', None) is not None:
+            detector.roi_tracker.update(None)
+
+        with self.lock:
+            self.created += 1
+            self.instances[id(detector)] = {
+                'id': self.created,
+                'init_ms': round((timings['import_seconds'] + timings['init_seconds']) * 1000, 3),
+                'first_call_ms': round(warmup[0] * 1000, 3) if warmup else None,
+                'steady_ms': round(warmup[-1] * 1000, 3) if len(warmup) > 1 else None,
+                'uses': 0,
+                'failures': 0,
+                'consecutive_failures': 0
+            }
+        return detector
+
+    def acquire(self, timeout=None):
+        """Pinjam instance; PoolTimeout jika tidak ada yang bebas dalam `timeout` detik"""
+        start = time.perf_counter()
+        try:
+            detector = self.available.get(timeout=self.acquire_timeout if timeout is None else timeout)
+        except queue.Empty:
+            with self.lock:
+                self.timeouts += 1
+            raise PoolTimeout(f"Tidak ada detektor bebas dalam {timeout or self.acquire_timeout} s")
+        with self.lock:
+            self.waits.append(time.perf_counter() - start)
+            self.instances[id(detector)]['uses'] += 1
+        return detector
+
+    def release(self, detector, failed=False):
+        """Kembalikan instance; instance yang terlalu sering error diganti yang baru"""
+        with self.lock:
+            info = self.instances[id(detector)]
+            if failed:
+                info['failures'] += 1
+                info['consecutive_failures'] += 1
+            else:
+                info['consecutive_failures'] = 0
+            unhealthy = info['consecutive_failures'] >= self.max_failures
+            if unhealthy:
+                self.replacing += 1
+
+        if not unhealthy:
+            self.available.put(detector)
+            return
+        # Model load + warm-up butuh waktu lama, jadi tidak dijalankan di thread
+        # request yang kebetulan mengembalikan instance ini
+        threading.Thread(target=self._replace, args=(detector,), name='detector-replace',
+                         daemon=True).start()
+
+    def _replace(self, detector):
+        """Buat instance pengganti, tutup instance lama, lalu masukkan pengganti ke pool"""
+        try:
+            replacement = self._create()
+        except Exception:
+            # Instance lama tetap dipakai agar ukuran pool tidak menyusut
+            with self.lock:
+                self.replacing -= 1
+                self.replace_failures += 1
+            self.available.put(detector)
+            return
+
+        with self.lock:
+            del self.instances[id(detector)]
+            self.replaced += 1
+            self.replacing -= 1
+        self.available.put(replacement)
+        close = getattr(detector, 'close', None)
+        if close is not None:
+            close()
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        """`with pool.checkout() as detector:`; error di dalam blok dicatat sebagai kegagalan"""
+        detector = self.acquire(timeout)
+        failed = False
+        try:
+            yield detector
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(detector, failed)
+
+    def stats(self):
+        with self.lock:
+            instances = sorted((dict(info) for info in self.instances.values()), key=lambda i: i['id'])
+            waits = list(self.waits)
+            created, replaced, timeouts = self.created, self.replaced, self.timeouts
+            replacing, replace_failures = self.replacing, self.replace_failures
+        available = self.available.qsize()
+        return {
+            'backend': self.backend,
+            'size': self.size,
+            'available': available,
+            'in_use': self.size - available - replacing,
+            'created': created,
+            'replaced': replaced,
+            'replacing': replacing,
+            'replace_failures': replace_failures,
+            'timeouts': timeouts,
+            'startup_seconds': round(self.startup_seconds, 3),
+            'warmup_frames': self.warmup_frames,
+            'warmup_resolution': list(self.warmup_image.shape[1::-1]),
+            'acquire_wait': latency_summary(waits),
+            'instances': instances
+        }
@@ -2,132 +2,231 @@ import cv2
 import numpy as np
 import os
 
+from config import WEBCAM_CONFIG, HAAR_CONFIG, EXPRESSION_CODES
+from buffer_pool import BufferPool
+from detection_result import FaceResult
+from instrumentation import NULL_TIMER, PerformanceOverlay
+from motion_gate import GatedDetector
+from pipeline import run_pipeline, print_pipeline_stats
+from rendering import HaarRenderer, guide_overlay
+
 class SimpleExpressionDetector:
-    def __init__(self):
-        # Load Haar Cascade untuk deteksi wajah
-        self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-        self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
-        self.smile_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_smile.xml')
+    def __init__(self, **haar_options):
+        # Pengaturan dari HAAR_CONFIG, bisa di-override per instance
+        self.haar_options = dict(HAAR_CONFIG)
+        self.haar_options.update(haar_options)
+        
+        # Load Haar Cascade untuk deteksi wajah; cascade mata dan senyum baru
+        # dimuat saat wajah pertama ditemukan
+        self.face_cascade = self.load_cascade(self.haar_options['face_cascade'])
+        self._eye_cascade = None
+        self._smile_cascade = None
         
         print("✓ Haar Cascades loaded successfully!")
         
-    def detect_expression(self, face_roi):
-        """Deteksi ekspresi sederhana berdasarkan mata dan senyum"""
-        gray_face = cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY) if len(face_roi.shape) == 3 else face_roi
+        # Hook timing per tahap (no-op kecuali diganti instrumentation.StageTimer)
+        self.timer = NULL_TIMER
+        
+        # Buffer grayscale yang dipakai ulang setiap frame
+        self.buffers = BufferPool()
+        
+        # Label per kode ekspresi; menggambar hanya dilakukan oleh renderer
+        self.expression_labels = ['😐 Neutral', '😊 Senang', '😢 Sedih', '😠 Marah']
+        self.renderer = HaarRenderer(self.expression_labels)
+        self.guide_overlay = guide_overlay([
+            "Panduan:",
+            "- Kotak Hijau: Wajah",
+            "- Kotak Biru: Mata",
+            "- Kotak Merah: Senyum"
+        ])
+        
+    @staticmethod
+    def load_cascade(filename):
+        """Muat cascade dari direktori bawaan OpenCV (atau path lengkap)"""
+        path = filename if os.path.isfile(filename) else cv2.data.haarcascades + filename
+        cascade = cv2.CascadeClassifier(path)
+        if cascade.empty():
+            raise IOError(f"Tidak dapat memuat cascade {filename}")
+        return cascade
+    
+    @property
+    def eye_cascade(self):
+        if self._eye_cascade is None:
+            self._eye_cascade = self.load_cascade(self.haar_options['eye_cascade'])
+        return self._eye_cascade
+    
+    @property
+    def smile_cascade(self):
+        if self._smile_cascade is None:
+            self._smile_cascade = self.load_cascade(self.haar_options['smile_cascade'])
+        return self._smile_cascade
+    
+    def detect_faces(self, gray):
+        """Deteksi wajah (x, y, w, h) di koordinat frame penuh, opsional pada salinan yang diperkecil"""
+        options = self.haar_options
+        scale = options['detection_scale']
+        h, w = gray.shape[:2]
+        if scale < 1.0:
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            small = cv2.resize(gray, size, dst=self.buffers.get(size[::-1], name='gray_small'),
+                               interpolation=cv2.INTER_AREA)
+        else:
+            scale = 1.0
+            small = gray
+        
+        # Batas ukuran wajah ditulis dalam piksel frame penuh
+        limits = {}
+        if options['min_face_size']:
+            limits['minSize'] = tuple(max(1, round(v * scale)) for v in options['min_face_size'])
+        if options['max_face_size']:
+            limits['maxSize'] = tuple(max(1, round(v * scale)) for v in options['max_face_size'])
         
-        # Deteksi mata
-        eyes = self.eye_cascade.detectMultiScale(gray_face, 1.1, 5)
+        faces = self.face_cascade.detectMultiScale(
+            small, options['scale_factor'], options['min_neighbors'], **limits)
+        if scale == 1.0 or len(faces) == 0:
+            return faces
         
-        # Deteksi senyum
-        smiles = self.smile_cascade.detectMultiScale(gray_face, 1.8, 20)
+        # Kembalikan kotak ke resolusi penuh
+        boxes = np.round(np.asarray(faces, dtype=np.float64) / scale).astype(np.int32)
+        boxes[:, :2] = np.clip(boxes[:, :2], 0, (w - 1, h - 1))
+        boxes[:, 2:] = np.minimum(boxes[:, 2:], (w, h) - boxes[:, :2])
+        return boxes
+    
+    def detect_features(self, face_gray):
+        """Satu kali deteksi mata dan senyum per wajah (koordinat relatif terhadap wajah)"""
+        h, w = face_gray.shape[:2]
+        
+        # Mata hanya dicari di setengah atas wajah, ukuran relatif terhadap lebar wajah
+        eyes = self.eye_cascade.detectMultiScale(
+            face_gray[:h // 2], 1.1, 5,
+            minSize=(max(1, w // 10), max(1, w // 10)),
+            maxSize=(w // 2, h // 2)
+        )
         
-        # Analisis sederhana
+        # Senyum hanya dicari di sepertiga bawah wajah
+        smile_top = h - h // 3
+        smiles = self.smile_cascade.detectMultiScale(
+            face_gray[smile_top:], 1.8, 20,
+            minSize=(max(1, w // 5), max(1, h // 12)),
+            maxSize=(w, h // 3)
+        )
+        
+        return {
+            'eyes': [(int(ex), int(ey), int(ew), int(eh)) for (ex, ey, ew, eh) in eyes],
+            'smiles': [(int(sx), int(sy) + smile_top, int(sw), int(sh)) for (sx, sy, sw, sh) in smiles]
+        }
+    
+    def classify_code(self, eyes, smiles):
+        """Klasifikasi sederhana dari hasil deteksi mata dan senyum, hasilnya kode ekspresi"""
         if len(smiles) > 0:
-            return "😊 Senang"
+            return EXPRESSION_CODES['HAPPY']
         elif len(eyes) < 2:  # Mata tertutup/menyipit bisa menandakan marah
-            return "😠 Marah"
+            return EXPRESSION_CODES['ANGRY']
         elif len(eyes) == 2:  # Mata normal tapi tidak senyum
             # Analisis tambahan berdasarkan posisi mata
-            if len(eyes) == 2:
-                eye1_y = eyes[0][1] + eyes[0][3]//2
-                eye2_y = eyes[1][1] + eyes[1][3]//2
-                
-                # Jika mata pada posisi normal
-                if abs(eye1_y - eye2_y) < 10:
-                    return "😐 Neutral"
-                else:
-                    return "😢 Sedih"
+            eye1_y = eyes[0][1] + eyes[0][3]//2
+            eye2_y = eyes[1][1] + eyes[1][3]//2
+            
+            # Jika mata pada posisi normal
+            if abs(eye1_y - eye2_y) < 10:
+                return EXPRESSION_CODES['NEUTRAL']
+            else:
+                return EXPRESSION_CODES['SAD']
         else:
-            return "😐 Neutral"
+            return EXPRESSION_CODES['NEUTRAL']
     
-    def process_frame(self, frame):
-        """Process satu frame"""
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    def classify_expression(self, eyes, smiles):
+        """Klasifikasi ekspresi sederhana berdasarkan hasil deteksi mata dan senyum"""
+        return self.expression_labels[self.classify_code(eyes, smiles)]
+    
+    def detect_expression(self, face_roi):
+        """Deteksi ekspresi sederhana berdasarkan mata dan senyum"""
+        gray_face = cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY) if len(face_roi.shape) == 3 else face_roi
+        parts = self.detect_features(gray_face)
+        return self.classify_expression(parts['eyes'], parts['smiles'])
+    
+    def detect(self, frame):
+        """Deteksi wajah dan ekspresi tanpa menggambar pada frame (list FaceResult)"""
+        timer = self.timer
+        with timer.stage('conversion'):
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self.buffers.get(frame.shape[:2], name='gray'))
         
         # Deteksi wajah
-        faces = self.face_cascade.detectMultiScale(gray, 1.1, 4)
+        with timer.stage('detection'):
+            faces = self.detect_faces(gray)
         
+        results = []
         for (x, y, w, h) in faces:
-            # Gambar rectangle untuk wajah
-            cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-            
-            # Extract ROI wajah
-            face_roi = frame[y:y+h, x:x+w]
-            face_gray = gray[y:y+h, x:x+w]
-            
-            # Deteksi ekspresi
-            expression = self.detect_expression(face_roi)
-            
-            # Gambar label ekspresi
-            label = f'Ekspresi: {expression}'
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            font_scale = 0.7
-            thickness = 2
-            
-            # Background untuk text
-            (text_width, text_height), _ = cv2.getTextSize(label, font, font_scale, thickness)
-            cv2.rectangle(frame, (x, y-35), (x + text_width + 10, y-5), (0, 0, 0), -1)
-            
-            # Text ekspresi
-            cv2.putText(frame, label, (x+5, y-15), font, font_scale, (0, 255, 0), thickness)
-            
-            # Deteksi dan gambar mata
-            eyes = self.eye_cascade.detectMultiScale(face_gray, 1.1, 5)
-            for (ex, ey, ew, eh) in eyes:
-                cv2.rectangle(frame, (x+ex, y+ey), (x+ex+ew, y+ey+eh), (255, 0, 0), 2)
-            
-            # Deteksi dan gambar senyum
-            smiles = self.smile_cascade.detectMultiScale(face_gray, 1.8, 20)
-            for (sx, sy, sw, sh) in smiles:
-                cv2.rectangle(frame, (x+sx, y+sy), (x+sx+sw, y+sy+sh), (0, 0, 255), 2)
-            
-            return frame, expression
+            # Hasil deteksi mata/senyum dipakai untuk klasifikasi sekaligus untuk digambar
+            with timer.stage('features'):
+                parts = self.detect_features(gray[y:y+h, x:x+w])
+            with timer.stage('classification'):
+                code = self.classify_code(parts['eyes'], parts['smiles'])
+            results.append(FaceResult((int(x), int(y), int(x + w), int(y + h)), code, parts=parts))
+        
+        timer.count_frame(len(results))
+        return results
+    
+    def draw_results(self, frame, faces):
+        """Gambar kotak wajah, label ekspresi, mata dan senyum; kembalikan (frame, label)"""
+        return self.renderer.draw(frame, faces)
+    
+    def process_frame(self, frame):
+        """Process satu frame"""
+        timer = self.timer
+        with timer.stage('total'):
+            faces = self.detect(frame)
+            with timer.stage('drawing'):
+                result = self.draw_results(frame, faces)
+        return result
+    
+    def show_frame(self, processed_frame, expression):
+        """Tahap render: gambar instruksi dan tampilkan frame; False jika 'q' ditekan"""
+        # Tambah instruksi dan panduan (dirender sekali, disalin dengan satu operasi)
+        self.guide_overlay.apply(processed_frame)
+        
+        # Tampilkan frame
+        cv2.imshow('Face Expression Detection - OpenCV Haar Cascade', processed_frame)
         
-        return frame, "Tidak Ada Wajah"
+        # Keluar jika 'q' ditekan
+        return cv2.waitKey(1) & 0xFF != ord('q')
     
-    def run_webcam(self):
-        """Jalankan deteksi dengan webcam"""
-        cap = cv2.VideoCapture(0)
+    def run_webcam(self, source=0, threaded=False, overlay=None, motion_gate=False):
+        """Jalankan deteksi dengan webcam (atau sumber VideoCapture lain)"""
+        cap = cv2.VideoCapture(source)
         
         if not cap.isOpened():
             print("Error: Tidak dapat mengakses webcam")
             return
         
+        # Resolusi webcam dari WEBCAM_CONFIG
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, WEBCAM_CONFIG['width'])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, WEBCAM_CONFIG['height'])
+        
         print("🎥 Memulai deteksi wajah dan ekspresi...")
         print("Tekan 'q' untuk keluar")
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                print("Error: Tidak dapat membaca frame")
-                break
-            
-            # Process frame
-            processed_frame, expression = self.process_frame(frame)
-            
-            # Tambah instruksi
-            cv2.putText(processed_frame, "Tekan 'q' untuk keluar", 
-                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-            
-            # Tambah panduan
-            guide = [
-                "Panduan:",
-                "- Kotak Hijau: Wajah",
-                "- Kotak Biru: Mata", 
-                "- Kotak Merah: Senyum"
-            ]
-            
-            for i, text in enumerate(guide):
-                cv2.putText(processed_frame, text, 
-                           (10, 60 + i * 20), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
-            
-            # Tampilkan frame
-            cv2.imshow('Face Expression Detection - OpenCV Haar Cascade', processed_frame)
-            
-            # Keluar jika 'q' ditekan
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
+        # Lewati inferensi selama adegan kamera statis tidak berubah
+        process_frame = GatedDetector(self).process_frame if motion_gate else self.process_frame
+        if WEBCAM_CONFIG['show_performance'] if overlay is None else overlay:
+            process_frame = PerformanceOverlay(process_frame)
+        
+        if threaded:
+            # Capture, inferensi dan render berjalan sebagai tahap pipeline terpisah
+            stats = run_pipeline(cap, process_frame, self.show_frame)
+            print_pipeline_stats(stats)
+        else:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    print("Error: Tidak dapat membaca frame")
+                    break
+                
+                # Process frame
+                processed_frame, expression = process_frame(frame)
+                
+                if not self.show_frame(processed_frame, expression):
+                    break
         
         cap.release()
         cv2.destroyAllWindows()
@@ -165,9 +264,10 @@ def main():
         print("Mode yang tersedia:")
         print("1. Webcam (Real-time)")
         print("2. Gambar (File)")
+        print("3. Webcam (Pipeline multi-thread)")
         print("=" * 60)
         
-        choice = input("Pilih mode (1/2): ")
+        choice = input("Pilih mode (1/2/3): ")
         
         if choice == "1":
             print("\n🎥 Memulai mode webcam...")
@@ -176,6 +276,9 @@ def main():
             image_path = input("Masukkan path gambar: ")
             print(f"\n🖼️ Memproses gambar: {image_path}")
             detector.process_image(image_path)
+        elif choice == "3":
+            print("\n🎥 Memulai mode webcam (pipeline multi-thread)...")
+            detector.run_webcam(threaded=True)
         else:
             print("❌ Pilihan tidak valid")
             
@@ -0,0 +1,277 @@
+"""
+Feature store berbasis memory-map dan sweep threshold ekspresi
+
+`build` menyimpan vektor 7 fitur setiap wajah (dari gambar atau file hasil
+JSONL) ke direktori store: matriks float32 mentah yang dibaca dengan
+np.memmap, label opsional (kode ekspresi, -1 = tanpa label) dan asal setiap
+baris. `sweep` mengevaluasi grid kombinasi threshold EXPRESSION_THRESHOLDS
+sekaligus secara vektor per potongan (chunk) store, sehingga store yang lebih
+besar dari RAM tetap bisa diproses. Hasilnya distribusi label per kombinasi,
+ditambah akurasi jika store berlabel.
+
+Contoh:
+    python feature_store.py build foto/ -o fitur/ --labels-from-dirs --cache .landmark_cache
+    python feature_store.py build hasil.jsonl -o fitur/
+    python feature_store.py sweep fitur/ --grid HAPPY.mouth_corner_threshold=-0.02:0:0.005 \\
+        --grid HAPPY.mouth_open_threshold=0.01,0.02,0.03 --top 10 -o sweep.json
+"""
+import argparse
+import copy
+import itertools
+import json
+import os
+
+import numpy as np
+
+from config import EXPRESSION_THRESHOLDS, EXPRESSION_CODES, EXPRESSION_LABELS
+from detection_result import EXPRESSION_NAMES
+from landmark_features import NUM_FEATURES, FEATURE_NAMES, classify_features
+
+FEATURES_FILE = 'features.f32'
+LABELS_FILE = 'labels.i8'
+SOURCES_FILE = 'sources.txt'
+META_FILE = 'meta.json'
+
+NO_LABEL = -1
+
+# Nama direktori yang dikenali sebagai label (nama kode atau label Indonesia)
+LABEL_NAMES = {name.lower(): code for name, code in EXPRESSION_CODES.items()}
+LABEL_NAMES.update({EXPRESSION_LABELS[name].lower(): code for name, code in EXPRESSION_CODES.items()})
+
+
+class FeatureStoreWriter:
+    """Tambahkan baris fitur (dan label) ke direktori store secara streaming"""
+
+    def __init__(self, directory, flush_rows=4096):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.flush_rows = flush_rows
+        self.features_file = open(os.path.join(directory, FEATURES_FILE), 'wb')
+        self.labels_file = open(os.path.join(directory, LABELS_FILE), 'wb')
+        self.sources_file = open(os.path.join(directory, SOURCES_FILE), 'w', encoding='utf-8')
+        self.features = []
+        self.labels = []
+        self.count = 0
+        self.labeled = 0
+
+    def append(self, features, label=NO_LABEL, source=''):
+        """Tambahkan satu vektor fitur (7,)"""
+        self.features.append(np.asarray(features, dtype=np.float32))
+        self.labels.append(label)
+        self.sources_file.write(source.replace('\n', ' ') + '\n')
+        self.count += 1
+        self.labeled += label != NO_LABEL
+        if len(self.features) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if self.features:
+            self.features_file.write(np.stack(self.features).tobytes())
+            self.labels_file.write(np.asarray(self.labels, dtype=np.int8).tobytes())
+            self.features = []
+            self.labels = []
+
+    def close(self):
+        self.flush()
+        for f in (self.features_file, self.labels_file, self.sources_file):
+            f.close()
+        meta = {
+            'count': self.count,
+            'labeled': self.labeled,
+            'num_features': NUM_FEATURES,
+            'feature_names': FEATURE_NAMES
+        }
+        with open(os.path.join(self.directory, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_store(directory):
+    """Buka store read-only: (fitur memmap (N, 7), label memmap (N,) atau None, meta)"""
+    with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+    count = meta['count']
+    if count == 0:
+        return np.zeros((0, NUM_FEATURES), dtype=np.float32), None, meta
+
+    features = np.memmap(os.path.join(directory, FEATURES_FILE), dtype=np.float32,
+                         mode='r', shape=(count, meta['num_features']))
+    labels = None
+    if meta['labeled']:
+        labels = np.memmap(os.path.join(directory, LABELS_FILE), dtype=np.int8,
+                           mode='r', shape=(count,))
+    return features, labels, meta
+
+
+def label_from_path(path):
+    """Kode ekspresi dari nama direktori induk (mis. foto/senang/1.jpg), atau NO_LABEL"""
+    name = os.path.basename(os.path.dirname(path)).lower()
+    return LABEL_NAMES.get(name, NO_LABEL)
+
+
+def build_from_images(paths, directory, backend='mediapipe', workers=None, labels_from_dirs=False,
+                      max_faces=None, cache_dir=None):
+    """Jalankan detektor pada gambar dan simpan fitur setiap wajah ke store"""
+    from batch_images import iter_images
+
+    with FeatureStoreWriter(directory) as writer:
+        for path, faces in iter_images(paths, backend, workers, max_faces=max_faces, cache_dir=cache_dir):
+            label = label_from_path(path) if labels_from_dirs else NO_LABEL
+            for i, face in enumerate(faces or []):
+                writer.append(face.features, label, f'{path}#{i}')
+    return writer.count
+
+
+def build_from_results(result_paths, directory):
+    """Salin fitur dari file hasil JSONL (video_processing.py / batch_images.py) ke store"""
+    with FeatureStoreWriter(directory) as writer:
+        for result_path in result_paths:
+            with open(result_path, encoding='utf-8') as f:
+                for line_number, line in enumerate(f):
+                    record = json.loads(line)
+                    key = record.get('path', record.get('frame', line_number))
+                    for i, face in enumerate(record.get('faces', [])):
+                        if face.get('features') is not None:
+                            writer.append(face['features'], source=f'{result_path}:{key}#{i}')
+    return writer.count
+
+
+def parse_grid_values(spec):
+    """'a:b:step' (inklusif) atau 'v1,v2,...' menjadi daftar nilai"""
+    if ':' in spec:
+        start, stop, step = (float(v) for v in spec.split(':'))
+        if step <= 0:
+            raise ValueError(f"Step grid harus > 0: {spec}")
+        return [round(v, 10) for v in np.arange(start, stop + step / 2, step)]
+    return [float(v) for v in spec.split(',')]
+
+
+def parse_grid(specs):
+    """Daftar 'EKSPRESI.nama_threshold=nilai' menjadi dict {(ekspresi, nama): [nilai...]}"""
+    grid = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        expression, _, threshold = name.partition('.')
+        if threshold not in EXPRESSION_THRESHOLDS.get(expression, {}):
+            raise ValueError(f"Threshold tidak dikenal: {name}")
+        grid[(expression, threshold)] = parse_grid_values(values)
+    return grid
+
+
+def grid_thresholds(grid, base=EXPRESSION_THRESHOLDS):
+    """Semua kombinasi grid sebagai satu dict threshold berisi kolom (S, 1)"""
+    keys = list(grid)
+    settings = list(itertools.product(*(grid[key] for key in keys)))
+    thresholds = copy.deepcopy(base)
+    for j, (expression, name) in enumerate(keys):
+        thresholds[expression][name] = np.array([s[j] for s in settings], dtype=np.float32)[:, None]
+    return keys, settings, thresholds
+
+
+def sweep(features, labels, grid, base=EXPRESSION_THRESHOLDS, max_elements=16_000_000):
+    """Evaluasi semua kombinasi threshold pada seluruh store, potongan demi potongan
+
+    Setiap potongan diklasifikasikan untuk semua S kombinasi sekaligus
+    (broadcast (S, 1) x (rows,)); ukuran potongan dipilih agar matriks
+    (S, rows) tidak melebihi `max_elements`.
+    """
+    keys, settings, thresholds = grid_thresholds(grid, base)
+    num_settings = len(settings)
+    num_codes = len(EXPRESSION_CODES)
+    rows = max(1, max_elements // num_settings)
+
+    counts = np.zeros((num_settings, num_codes), dtype=np.int64)
+    correct = np.zeros(num_settings, dtype=np.int64)
+    labeled = 0
+
+    for start in range(0, len(features), rows):
+        # Hanya potongan ini yang dibaca dari memmap ke RAM
+        chunk = np.asarray(features[start:start + rows])
+        codes = classify_features(chunk, thresholds)
+        if codes.ndim == 1:
+            codes = codes[None, :]
+        for code in range(num_codes):
+            counts[:, code] += (codes == code).sum(axis=1)
+
+        if labels is not None:
+            chunk_labels = np.asarray(labels[start:start + rows])
+            mask = chunk_labels != NO_LABEL
+            labeled += int(mask.sum())
+            correct += (codes[:, mask] == chunk_labels[mask]).sum(axis=1)
+
+    results = []
+    for i, values in enumerate(settings):
+        result = {
+            'thresholds': {f'{expression}.{name}': value for (expression, name), value in zip(keys, values)},
+            'counts': {EXPRESSION_NAMES[code]: int(counts[i, code]) for code in range(num_codes)}
+        }
+        if labeled:
+            result['accuracy'] = round(float(correct[i]) / labeled, 6)
+        results.append(result)
+
+    if labeled:
+        results.sort(key=lambda r: r['accuracy'], reverse=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature store memmap dan sweep threshold ekspresi")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="Isi store dari gambar atau file hasil JSONL")
+    build.add_argument('input', nargs='+', help="Direktori/glob gambar, atau file .jsonl hasil deteksi")
+    build.add_argument('-o', '--output', required=True, help="Direktori store")
+    build.add_argument('--backend', choices=['mediapipe', 'mediapipe-simple'], default='mediapipe')
+    build.add_argument('--workers', type=int, help="Jumlah proses worker (default: jumlah CPU)")
+    build.add_argument('--max-faces', type=int, help="Jumlah wajah maksimum per gambar")
+    build.add_argument('--cache', metavar='DIR', help="Cache landmark (lihat landmark_cache.py)")
+    build.add_argument('--labels-from-dirs', action='store_true',
+                       help="Label dari nama direktori induk (senang/sedih/marah/neutral)")
+
+    sweep_parser = commands.add_parser('sweep', help="Evaluasi grid threshold pada store")
+    sweep_parser.add_argument('store', help="Direktori store")
+    sweep_parser.add_argument('--grid', action='append', required=True,
+                              help="EKSPRESI.threshold=a:b:step atau =v1,v2 (boleh berulang)")
+    sweep_parser.add_argument('--top', type=int, default=10, help="Jumlah kombinasi yang ditampilkan")
+    sweep_parser.add_argument('-o', '--output', help="Simpan semua hasil ke file JSON")
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        if all(path.lower().endswith('.jsonl') for path in args.input):
+            count = build_from_results(args.input, args.output)
+        else:
+            from batch_images import collect_images
+            paths = [path for pattern in args.input for path in collect_images(pattern)]
+            count = build_from_images(paths, args.output, args.backend, args.workers,
+                                      args.labels_from_dirs, args.max_faces, args.cache)
+        print(f"Store {args.output}: {count} vektor fitur")
+        return
+
+    try:
+        grid = parse_grid(args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+
+    features, labels, meta = open_store(args.store)
+    results = sweep(features, labels, grid)
+    print(f"{meta['count']} baris, {len(results)} kombinasi threshold"
+          + (f", {meta['labeled']} berlabel" if labels is not None else ""))
+    for result in results[:args.top]:
+        thresholds = ', '.join(f'{name}={value:g}' for name, value in result['thresholds'].items())
+        accuracy = f"akurasi {result['accuracy']:.4f}  " if 'accuracy' in result else ''
+        print(f"  {accuracy}{thresholds}  {result['counts']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Hasil disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
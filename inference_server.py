@@ -0,0 +1,278 @@
+"""
+Layanan HTTP lokal untuk deteksi wajah dan ekspresi
+
+Endpoint:
+    POST /detect            body: gambar terenkode (JPEG/PNG)
+    POST /detect?width=W&height=H
+                            body: frame mentah BGR uint8 (W*H*3 byte)
+    GET  /metrics           statistik antrian, latensi dan throughput (JSON)
+    GET  /health            status layanan
+
+Request dilayani oleh DetectorPool (detector_pool.py): semua instance dibuat
+dan di-warm-up saat start, sehingga request pertama tidak membayar cold start.
+Paling banyak `workers` request diproses bersamaan, `max_queue` request lain
+boleh menunggu detektor (paling lama `queue_timeout` detik); selebihnya
+langsung ditolak dengan 503.
+
+Contoh:
+    python inference_server.py --backend mediapipe --workers 2
+    curl --data-binary @foto.jpg http://127.0.0.1:8080/detect
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+import numpy as np
+
+from backends import BACKENDS
+from config import DEFAULT_BACKEND, SERVER_CONFIG
+from detector_pool import DetectorPool, PoolTimeout
+from instrumentation import latency_summary
+from result_writer import face_record
+
+
+class ServiceBusy(Exception):
+    """Antrian penuh atau tidak ada detektor yang bebas dalam batas waktu"""
+
+
+class InferenceService:
+    """Pool detektor dengan batas antrian dan statistik latensi/throughput"""
+
+    def __init__(self, backend='haar', workers=None, max_queue=None, queue_timeout=None,
+                 latency_window=None, warmup_image=None, **detector_options):
+        config = SERVER_CONFIG
+        self.backend = backend
+        self.workers = workers or config['workers']
+        self.max_queue = config['max_queue'] if max_queue is None else max_queue
+        self.queue_timeout = queue_timeout or config['queue_timeout']
+
+        # Setiap request adalah gambar terpisah, jadi MediaPipe dijalankan dalam mode gambar
+        if backend != 'haar':
+            detector_options.setdefault('static_image_mode', True)
+        self.pool = DetectorPool(backend, self.workers, warmup_image=warmup_image,
+                                 acquire_timeout=self.queue_timeout, **detector_options)
+
+        # Slot penerimaan: request yang sedang diproses + yang menunggu
+        self.slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'completed': 0, 'rejected': 0, 'errors': 0, 'faces': 0}
+        self.in_flight = 0
+        self.waiting = 0
+        window = latency_window or config['latency_window']
+        self.latencies = deque(maxlen=window)
+        self.queue_waits = deque(maxlen=window)
+        self.completed_at = deque(maxlen=window)
+        self.started = time.time()
+
+    def _count(self, name, value=1):
+        with self.lock:
+            self.counts[name] += value
+
+    def detect(self, image):
+        """Jalankan deteksi dengan detektor dari pool; ServiceBusy jika antrian penuh"""
+        self._count('requests')
+        if not self.slots.acquire(blocking=False):
+            self._count('rejected')
+            raise ServiceBusy("Antrian penuh")
+        try:
+            start = time.perf_counter()
+            with self.lock:
+                self.waiting += 1
+            try:
+                detector = self.pool.acquire()
+            except PoolTimeout:
+                self._count('rejected')
+                raise ServiceBusy("Tidak ada detektor bebas")
+            finally:
+                with self.lock:
+                    self.waiting -= 1
+            acquired = time.perf_counter()
+
+            with self.lock:
+                self.in_flight += 1
+            failed = False
+            try:
+                faces = detector.detect(image)
+            except Exception:
+                failed = True
+                self._count('errors')
+                raise
+            finally:
+                self.pool.release(detector, failed)
+                with self.lock:
+                    self.in_flight -= 1
+
+            done = time.perf_counter()
+            with self.lock:
+                self.counts['completed'] += 1
+                self.counts['faces'] += len(faces)
+                self.latencies.append(done - start)
+                self.queue_waits.append(acquired - start)
+                self.completed_at.append(time.time())
+            return faces, done - start
+        finally:
+            self.slots.release()
+
+    def metrics(self):
+        with self.lock:
+            latencies = list(self.latencies)
+            queue_waits = list(self.queue_waits)
+            completed_at = list(self.completed_at)
+            counts = dict(self.counts)
+            in_flight, waiting = self.in_flight, self.waiting
+
+        now = time.time()
+        uptime = now - self.started
+        # Throughput dari request yang selesai dalam 60 detik terakhir
+        recent = sum(1 for t in completed_at if now - t <= 60)
+        return {
+            'backend': self.backend,
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'uptime_seconds': round(uptime, 3),
+            'counts': counts,
+            'in_flight': in_flight,
+            'waiting': waiting,
+            'throughput_rps': round(counts['completed'] / uptime, 3) if uptime > 0 else 0.0,
+            'recent_throughput_rps': round(recent / min(60.0, uptime), 3) if uptime > 0 else 0.0,
+            'latency': latency_summary(latencies),
+            'queue_wait': latency_summary(queue_waits),
+            'pool': self.pool.stats()
+        }
+
+
+def decode_image(body, query):
+    """Gambar BGR dari body request: frame mentah jika width/height diberikan, selain itu JPEG/PNG"""
+    if 'width' in query or 'height' in query:
+        if 'width' not in query or 'height' not in query:
+            raise ValueError("width dan height wajib diisi")
+        width = int(query['width'][0])
+        height = int(query['height'][0])
+        if width <= 0 or height <= 0 or len(body) != width * height * 3:
+            raise ValueError(f"Frame mentah harus {width}x{height}x3 byte uint8 BGR")
+        return np.frombuffer(body, dtype=np.uint8).reshape(height, width, 3)
+
+    image = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Body bukan gambar JPEG/PNG yang valid")
+    return image
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    """Handler HTTP; `self.server.service` adalah InferenceService"""
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/metrics':
+            self.send_json(200, self.server.service.metrics())
+        elif path == '/health':
+            pool = self.server.service.pool
+            self.send_json(200, {'status': 'ok', 'backend': pool.backend,
+                                 'detectors': pool.size, 'available': pool.available.qsize()})
+        else:
+            self.send_json(404, {'error': f"Endpoint tidak dikenal: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/detect':
+            self.send_json(404, {'error': f"Endpoint tidak dikenal: {url.path}"})
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            self.send_json(400, {'error': "Body kosong"})
+            return
+        if length > self.server.max_body_bytes:
+            self.send_json(413, {'error': "Body terlalu besar"})
+            return
+        body = self.rfile.read(length)
+
+        try:
+            image = decode_image(body, parse_qs(url.query))
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+
+        try:
+            faces, seconds = self.server.service.detect(image)
+        except ServiceBusy as e:
+            self.send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+            return
+        except Exception as e:
+            self.send_json(500, {'error': repr(e)})
+            return
+
+        h, w = image.shape[:2]
+        self.send_json(200, {
+            'width': w,
+            'height': h,
+            'latency_ms': round(seconds * 1000, 3),
+            'faces': [face_record(face) for face in faces]
+        })
+
+    def log_message(self, format, *args):
+        # Log per request dimatikan; statistik tersedia di /metrics
+        pass
+
+
+def create_server(service, host=None, port=None, max_body_mb=None):
+    """ThreadingHTTPServer yang melayani `service`"""
+    config = SERVER_CONFIG
+    server = ThreadingHTTPServer((host or config['host'], config['port'] if port is None else port),
+                                 InferenceHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.max_body_bytes = int((max_body_mb or config['max_body_mb']) * 1024 * 1024)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layanan HTTP lokal deteksi wajah dan ekspresi")
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument('--host', default=SERVER_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=SERVER_CONFIG['port'])
+    parser.add_argument('--workers', type=int, help="Jumlah instance detektor (default: SERVER_CONFIG)")
+    parser.add_argument('--max-queue', type=int, help="Request yang boleh menunggu (default: SERVER_CONFIG)")
+    parser.add_argument('--max-faces', type=int, help="MediaPipe: jumlah wajah maksimum per gambar")
+    parser.add_argument('--warmup-image', help="Gambar berwajah untuk warm-up (default: frame dummy)")
+    args = parser.parse_args()
+
+    options = {}
+    if args.max_faces:
+        if args.backend == 'haar':
+            parser.error("--max-faces hanya untuk backend MediaPipe")
+        options['max_num_faces'] = args.max_faces
+
+    service = InferenceService(args.backend, args.workers, args.max_queue,
+                               warmup_image=args.warmup_image, **options)
+    server = create_server(service, args.host, args.port)
+    host, port = server.server_address[:2]
+    pool = service.pool.stats()
+    print(f"Layanan {args.backend} ({pool['size']} detektor, warm-up {pool['startup_seconds']:.2f} s) "
+          f"di http://{host}:{port}")
+    print("Endpoint: POST /detect, GET /metrics, GET /health - Ctrl+C untuk berhenti")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Instrumentasi waktu per tahap dan metrik untuk process_frame
+
+Setiap detektor memiliki atribut `timer`. Defaultnya NULL_TIMER (tanpa biaya
+berarti); ganti dengan StageTimer (benchmark) atau MetricsRecorder (metrik
+dengan sink: histogram di memori, file teks Prometheus, log JSON).
+"""
+import bisect
+import json
+import os
+import time
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullTimer:
+    """Timer nonaktif: stage() mengembalikan context manager kosong yang sama"""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def count_frame(self, faces):
+        pass
+
+    def count(self, name, value=1):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class _Stage:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class StageTimer:
+    """Kumpulkan durasi (detik) setiap tahap"""
+
+    enabled = True
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.counters = defaultdict(int)
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def record(self, name, seconds):
+        self.samples[name].append(seconds)
+
+    def count_frame(self, faces):
+        count_frame(self.counters, faces)
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def reset(self):
+        self.samples.clear()
+        self.counters.clear()
+
+    def summary(self):
+        """Statistik per tahap dalam milidetik"""
+        return {name: latency_summary(values) for name, values in self.samples.items()}
+
+
+def count_frame(counters, faces):
+    """Perbarui counter frame, wajah dan frame tanpa wajah"""
+    counters['frames'] += 1
+    counters['faces'] += faces
+    if not faces:
+        counters['no_face_frames'] += 1
+
+
+def latency_summary(seconds):
+    """Jumlah sampel, rata-rata dan persentil p50/p95/p99 (ms) dari daftar durasi"""
+    values = np.asarray(seconds, dtype=np.float64) * 1000
+    if values.size == 0:
+        return {'count': 0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': int(values.size),
+        'mean_ms': round(float(values.mean()), 4),
+        'p50_ms': round(float(p50), 4),
+        'p95_ms': round(float(p95), 4),
+        'p99_ms': round(float(p99), 4),
+        'max_ms': round(float(values.max()), 4)
+    }
+
+
+# Batas bucket histogram (detik), cocok untuk anggaran frame 30 fps
+HISTOGRAM_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class HistogramSink:
+    """Histogram durasi per tahap dan counter di memori"""
+
+    def __init__(self, buckets=HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.histograms = {}
+        self.counters = defaultdict(int)
+
+    def observe(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = {
+                'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+        histogram['counts'][bisect.bisect_left(self.buckets, seconds)] += 1
+        histogram['sum'] += seconds
+        histogram['count'] += 1
+
+    def count_frame(self, faces):
+        count_frame(self.counters, faces)
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def flush(self):
+        pass
+
+    def close(self):
+        """Tulis data terakhir; sink tidak dipakai lagi setelah ini"""
+        self.flush()
+
+
+class PrometheusFileSink(HistogramSink):
+    """Tulis ulang file teks Prometheus (untuk textfile collector) secara berkala"""
+
+    def __init__(self, path, interval=5.0, prefix='face_expression', buckets=HISTOGRAM_BUCKETS):
+        super().__init__(buckets)
+        self.path = path
+        self.interval = interval
+        self.prefix = prefix
+        self.last_write = time.monotonic()
+
+    def count_frame(self, faces):
+        super().count_frame(faces)
+        if time.monotonic() - self.last_write >= self.interval:
+            self.flush()
+
+    def render(self):
+        name = f'{self.prefix}_stage_seconds'
+        lines = [f'# HELP {name} Durasi tahap process_frame',
+                 f'# TYPE {name} histogram']
+        for stage, histogram in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, histogram['counts']):
+                cumulative += count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram["sum"]:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram["count"]}')
+        # Counter frame selalu ditulis; counter lain (mis. skipped_frames) jika pernah dicatat
+        extra = sorted(set(self.counters) - {'frames', 'faces', 'no_face_frames'})
+        for counter in ['frames', 'faces', 'no_face_frames'] + extra:
+            metric = f'{self.prefix}_{counter}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {self.counters[counter]}')
+        return '\n'.join(lines) + '\n'
+
+    def flush(self):
+        # Tulis ke file sementara lalu rename agar collector tidak membaca file setengah jadi
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, self.path)
+        self.last_write = time.monotonic()
+
+
+class JsonLogSink:
+    """Tambahkan satu baris JSON ringkasan latensi dan counter setiap interval"""
+
+    def __init__(self, path, interval=5.0):
+        self.file = open(path, 'a', encoding='utf-8')
+        self.interval = interval
+        self.samples = defaultdict(list)
+        self.counters = defaultdict(int)
+        self.last_write = time.monotonic()
+
+    def observe(self, name, seconds):
+        self.samples[name].append(seconds)
+
+    def count_frame(self, faces):
+        count_frame(self.counters, faces)
+        if time.monotonic() - self.last_write >= self.interval:
+            self.flush()
+
+    def count(self, name, value=1):
+        self.counters[name] += value
+
+    def flush(self):
+        if self.counters:
+            record = {
+                'time': round(time.time(), 3),
+                'counters': dict(self.counters),
+                'stages': {name: latency_summary(values) for name, values in self.samples.items()}
+            }
+            self.file.write(json.dumps(record) + '\n')
+            self.file.flush()
+        # Setiap baris merangkum satu interval
+        self.samples.clear()
+        self.counters.clear()
+        self.last_write = time.monotonic()
+
+    def close(self):
+        """Tulis interval terakhir lalu tutup file log"""
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+
+class MetricsRecorder:
+    """Timer aktif yang meneruskan durasi tahap dan counter frame ke sink"""
+
+    enabled = True
+
+    def __init__(self, sinks=None):
+        self.sinks = list(sinks) if sinks else [HistogramSink()]
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def record(self, name, seconds):
+        for sink in self.sinks:
+            sink.observe(name, seconds)
+
+    def count_frame(self, faces):
+        for sink in self.sinks:
+            sink.count_frame(faces)
+
+    def count(self, name, value=1):
+        for sink in self.sinks:
+            sink.count(name, value)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        """Flush terakhir untuk setiap sink dan lepaskan file-nya"""
+        for sink in self.sinks:
+            sink.close()
+
+
+def create_metrics(prometheus_path=None, json_log_path=None, interval=5.0):
+    """MetricsRecorder untuk sink yang diminta, atau NULL_TIMER jika tidak ada"""
+    sinks = []
+    if prometheus_path:
+        sinks.append(PrometheusFileSink(prometheus_path, interval))
+    if json_log_path:
+        sinks.append(JsonLogSink(json_log_path, interval))
+    return MetricsRecorder(sinks) if sinks else NULL_TIMER
+
+
+class PerformanceOverlay:
+    """Bungkus process_frame: ukur latensi dan gambar FPS/latensi di frame (mode webcam)"""
+
+    def __init__(self, process_frame, smoothing=0.9):
+        self.process_frame = process_frame
+        self.smoothing = smoothing
+        self.latency_ms = None
+        self.fps = None
+        self.last_time = None
+
+    def __call__(self, frame):
+        start = time.perf_counter()
+        processed_frame, expression = self.process_frame(frame)
+        now = time.perf_counter()
+
+        latency_ms = 1000 * (now - start)
+        self.latency_ms = latency_ms if self.latency_ms is None else (
+            self.smoothing * self.latency_ms + (1 - self.smoothing) * latency_ms)
+        if self.last_time is not None and now > self.last_time:
+            fps = 1.0 / (now - self.last_time)
+            self.fps = fps if self.fps is None else self.smoothing * self.fps + (1 - self.smoothing) * fps
+        self.last_time = now
+
+        h = processed_frame.shape[0]
+        text = f'FPS: {self.fps or 0:.1f}  Latensi: {self.latency_ms:.1f} ms'
+        cv2.putText(processed_frame, text, (10, h - 45),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+        return processed_frame, expression
@@ -0,0 +1,160 @@
+"""
+Cache landmark Face Mesh berbasis isi gambar (content-addressed)
+
+Kunci cache adalah hash piksel gambar ditambah pengaturan Face Mesh, isinya
+landmark mentah (F, n, 3) float32. Saat threshold atau aturan klasifikasi
+diubah, pemrosesan ulang gambar yang sama langsung lanjut ke ekstraksi fitur
+dan klasifikasi tanpa menjalankan Face Mesh lagi.
+
+Cache terdiri dari LRU di memori (dibatasi ukuran byte) di depan direktori
+file .npy di disk (juga dibatasi ukuran; file yang paling lama tidak dipakai
+dihapus lebih dulu). Direktori yang sama aman dipakai beberapa proses; ukuran
+direktori dihitung ulang dari disk secara berkala sehingga file dari proses
+lain ikut terhitung.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from config import LANDMARK_CACHE_CONFIG
+
+
+def cache_key(image, settings):
+    """Hash isi gambar (piksel + bentuk) dan pengaturan yang memengaruhi landmark"""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(image.shape).encode())
+    digest.update(np.ascontiguousarray(image).data)
+    digest.update(json.dumps(settings, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class LandmarkCache:
+    """LRU di memori di depan cache file .npy di disk"""
+
+    def __init__(self, directory=None, max_memory_mb=None, max_disk_mb=None, rescan_interval=None):
+        config = LANDMARK_CACHE_CONFIG
+        self.directory = directory or config['directory']
+        self.max_memory_bytes = int((max_memory_mb or config['max_memory_mb']) * 1024 * 1024)
+        max_disk_mb = config['max_disk_mb'] if max_disk_mb is None else max_disk_mb
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024) if max_disk_mb else None
+        self.rescan_interval = rescan_interval or config['rescan_interval']
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        # Perkiraan ukuran direktori: dihitung dari disk saat pertama kali, setiap
+        # `rescan_interval` penulisan dan saat prune, di antaranya diperbarui per file
+        self.disk_bytes = None
+        self.writes_since_scan = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + '.npy')
+
+    def get(self, key):
+        """Landmark tersimpan (F, n, 3) atau None"""
+        points = self.memory.get(key)
+        if points is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return points
+
+        path = self._path(key)
+        try:
+            points = np.load(path)
+            # Sentuh file agar eviction disk mengikuti waktu pemakaian terakhir
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.disk_hits += 1
+        self._remember(key, points)
+        return points
+
+    def put(self, key, points):
+        """Simpan salinan landmark (F, n, 3) ke memori dan disk"""
+        points = np.array(points, dtype=np.float32)
+        self._remember(key, points)
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Tulis ke file sementara lalu rename agar proses lain tidak membaca file setengah jadi
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, points)
+        # Kunci yang ditulis ulang menggantikan file lama, ukurannya tidak dihitung dua kali
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        os.replace(tmp_path, path)
+
+        if self.max_disk_bytes:
+            self.writes_since_scan += 1
+            if self.disk_bytes is None or self.writes_since_scan >= self.rescan_interval:
+                self.disk_bytes = self._disk_usage()
+                self.writes_since_scan = 0
+            else:
+                self.disk_bytes += os.path.getsize(path) - old_size
+            if self.disk_bytes > self.max_disk_bytes:
+                self.prune()
+
+    def _remember(self, key, points):
+        points.setflags(write=False)
+        if key in self.memory:
+            self.memory_bytes -= self.memory.pop(key).nbytes
+        self.memory[key] = points
+        self.memory_bytes += points.nbytes
+        while self.memory_bytes > self.max_memory_bytes and len(self.memory) > 1:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= evicted.nbytes
+
+    def _files(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.npy'):
+                    yield os.path.join(root, name)
+
+    def _disk_usage(self):
+        return sum(os.path.getsize(path) for path in self._files())
+
+    def prune(self):
+        """Hapus file yang paling lama tidak dipakai sampai ukuran cache <= 90% batas"""
+        entries = []
+        for path in self._files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self.disk_bytes = total
+        self.writes_since_scan = 0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'memory_items': len(self.memory),
+            'memory_mb': round(self.memory_bytes / (1024 * 1024), 2)
+        }
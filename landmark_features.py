@@ -0,0 +1,180 @@
+"""
+Ekstraksi fitur ekspresi berbasis array dari landmark MediaPipe Face Mesh
+"""
+import numpy as np
+
+from config import LANDMARKS, EXPRESSION_THRESHOLDS, EXPRESSION_CODES
+
+# Jumlah landmark Face Mesh (468 titik + 10 titik iris jika refine_landmarks=True)
+NUM_LANDMARKS = 478
+
+LEFT_EYE = np.array(LANDMARKS['LEFT_EYE'])
+RIGHT_EYE = np.array(LANDMARKS['RIGHT_EYE'])
+MOUTH = np.array(LANDMARKS['MOUTH'])
+EYEBROWS = np.array(LANDMARKS['EYEBROWS'])
+MOUTH_LEFT, MOUTH_RIGHT = LANDMARKS['MOUTH_CORNERS']
+MOUTH_CENTER = LANDMARKS['MOUTH_CENTER'][0]
+EYEBROW_LEFT, EYEBROW_RIGHT = LANDMARKS['EYEBROW_CENTER']
+
+# Pasangan titik untuk semua jarak yang dibutuhkan, dihitung dalam satu gather:
+# EAR kiri (A, B, C), EAR kanan (A, B, C), MAR (A, B, C), jarak alis
+_PAIRS = np.array([
+    [LEFT_EYE[1], LEFT_EYE[5]], [LEFT_EYE[2], LEFT_EYE[4]], [LEFT_EYE[0], LEFT_EYE[3]],
+    [RIGHT_EYE[1], RIGHT_EYE[5]], [RIGHT_EYE[2], RIGHT_EYE[4]], [RIGHT_EYE[0], RIGHT_EYE[3]],
+    [MOUTH[2], MOUTH[10]], [MOUTH[4], MOUTH[8]], [MOUTH[0], MOUTH[6]],
+    [EYEBROW_LEFT, EYEBROW_RIGHT],
+])
+_PAIR_START = _PAIRS[:, 0]
+_PAIR_END = _PAIRS[:, 1]
+
+NUM_FEATURES = 7
+FEATURE_NAMES = ['ear_left', 'ear_right', 'mar', 'eyebrow_height',
+                 'mouth_corner_left', 'mouth_corner_right', 'eyebrow_distance']
+
+
+class LandmarkBuffer:
+    """Buffer float32 yang dipakai ulang untuk menampung landmark wajah setiap frame"""
+
+    def __init__(self, max_faces=1, num_landmarks=NUM_LANDMARKS, dims=2):
+        self.dims = dims
+        self.points = np.zeros((max_faces, num_landmarks, dims), dtype=np.float32)
+
+    def fill(self, landmarks, index=0):
+        """Salin landmark MediaPipe ke buffer dan kembalikan view (n, dims)"""
+        landmark = landmarks.landmark
+        n = len(landmark)
+        if index >= self.points.shape[0] or n > self.points.shape[1]:
+            self._grow(index + 1, n)
+
+        if self.dims == 2:
+            values = (v for lm in landmark for v in (lm.x, lm.y))
+        else:
+            values = (v for lm in landmark for v in (lm.x, lm.y, lm.z))
+        view = self.points[index, :n]
+        view.reshape(-1)[:] = np.fromiter(values, dtype=np.float32, count=n * self.dims)
+        return view
+
+    def fill_all(self, landmark_lists):
+        """Salin landmark semua wajah ke buffer dan kembalikan view bertumpuk (F, n, dims)"""
+        if not len(landmark_lists):
+            return self.points[:0]
+        for index, landmarks in enumerate(landmark_lists):
+            view = self.fill(landmarks, index)
+        return self.points[:len(landmark_lists), :view.shape[0]]
+
+    def _grow(self, max_faces, num_landmarks):
+        faces, landmarks, dims = self.points.shape
+        grown = np.zeros((max(faces, max_faces), max(landmarks, num_landmarks), dims), dtype=np.float32)
+        grown[:faces, :landmarks] = self.points
+        self.points = grown
+
+
+def _safe_ratio(numerator, denominator):
+    """Pembagian elementwise yang menghasilkan 0 jika penyebut 0"""
+    out = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def compute_features(points):
+    """Hitung 7 fitur ekspresi dari array landmark (..., n, 2|3)
+
+    Urutan fitur: EAR kiri, EAR kanan, MAR, tinggi alis, tinggi sudut mulut
+    kiri, tinggi sudut mulut kanan, jarak alis.
+    """
+    xy = points[..., :2]
+
+    # Semua jarak (EAR, MAR, alis) sekaligus
+    distances = np.linalg.norm(xy[..., _PAIR_START, :] - xy[..., _PAIR_END, :], axis=-1)
+    vertical = distances[..., [0, 3, 6]] + distances[..., [1, 4, 7]]
+    horizontal = 2.0 * distances[..., [2, 5, 8]]
+    ratios = _safe_ratio(vertical, horizontal)
+
+    y = xy[..., 1]
+    features = np.empty(points.shape[:-2] + (NUM_FEATURES,), dtype=points.dtype)
+    features[..., 0:3] = ratios
+    features[..., 3] = y[..., EYEBROWS].mean(axis=-1)
+    features[..., 4] = y[..., MOUTH_LEFT] - y[..., MOUTH_CENTER]
+    features[..., 5] = y[..., MOUTH_RIGHT] - y[..., MOUTH_CENTER]
+    features[..., 6] = distances[..., 9]
+    return features
+
+
+def bounding_box(points, width, height):
+    """Bounding box piksel (x_min, y_min, x_max, y_max) dari landmark ternormalisasi"""
+    x = points[..., 0]
+    y = points[..., 1]
+    return (int(float(x.min()) * width), int(float(y.min()) * height),
+            int(float(x.max()) * width), int(float(y.max()) * height))
+
+
+def bounding_boxes(points, width, height):
+    """Bounding box piksel (F, 4) int untuk landmark bertumpuk (F, n, 2|3)"""
+    xy = points[..., :2]
+    # Dihitung dalam float64 agar pembulatan sama dengan bounding_box
+    scale = np.array([width, height], dtype=np.float64)
+    mins = xy.min(axis=-2).astype(np.float64) * scale
+    maxs = xy.max(axis=-2).astype(np.float64) * scale
+    return np.concatenate([mins, maxs], axis=-1).astype(int)
+
+
+def extract_features_batch(points):
+    """Hitung matriks fitur (N, 7) dari array landmark (N, n, 2|3)"""
+    points = np.asarray(points, dtype=np.float32)
+    if points.ndim != 3 or points.shape[-1] not in (2, 3):
+        raise ValueError(f"Bentuk landmark harus (N, n, 2|3), bukan {points.shape}")
+    return compute_features(points)
+
+
+def classify_features(features, thresholds=EXPRESSION_THRESHOLDS):
+    """Klasifikasi rule-based untuk matriks fitur (N, 7), hasilnya kode ekspresi"""
+    features = np.asarray(features)
+    avg_ear = (features[..., 0] + features[..., 1]) / 2
+    mar = features[..., 2]
+    eyebrow_height = features[..., 3]
+    avg_corner = (features[..., 4] + features[..., 5]) / 2
+    eyebrow_distance = features[..., 6]
+
+    happy = thresholds['HAPPY']
+    sad = thresholds['SAD']
+    angry = thresholds['ANGRY']
+
+    # Urutan kondisi sama dengan classify_expression: Senang, Sedih, Marah
+    conditions = [
+        (avg_corner < happy['mouth_corner_threshold']) & (mar > happy['mouth_open_threshold']),
+        (avg_corner > sad['mouth_corner_threshold']) & (eyebrow_height > sad['eyebrow_height_threshold']),
+        (eyebrow_distance < angry['eyebrow_distance_threshold'])
+        & (eyebrow_height > angry['eyebrow_height_threshold'])
+        & (avg_ear < angry['eye_openness_threshold']),
+    ]
+    choices = [EXPRESSION_CODES['HAPPY'], EXPRESSION_CODES['SAD'], EXPRESSION_CODES['ANGRY']]
+    return np.select(conditions, choices, EXPRESSION_CODES['NEUTRAL']).astype(np.int8)
+
+
+def expression_margins(features, thresholds=EXPRESSION_THRESHOLDS):
+    """Margin bertanda setiap aturan (Senang, Sedih, Marah) untuk fitur (..., 7) -> (..., 3)
+
+    Margin suatu aturan adalah selisih terkecil antara fitur dan threshold
+    kondisinya: positif berarti semua kondisi terpenuhi, dan semakin besar
+    semakin jauh dari batas keputusan.
+    """
+    features = np.asarray(features)
+    avg_ear = (features[..., 0] + features[..., 1]) / 2
+    mar = features[..., 2]
+    eyebrow_height = features[..., 3]
+    avg_corner = (features[..., 4] + features[..., 5]) / 2
+    eyebrow_distance = features[..., 6]
+
+    happy = thresholds['HAPPY']
+    sad = thresholds['SAD']
+    angry = thresholds['ANGRY']
+
+    margins = np.empty(features.shape[:-1] + (3,), dtype=features.dtype)
+    margins[..., 0] = np.minimum(happy['mouth_corner_threshold'] - avg_corner,
+                                 mar - happy['mouth_open_threshold'])
+    margins[..., 1] = np.minimum(avg_corner - sad['mouth_corner_threshold'],
+                                 eyebrow_height - sad['eyebrow_height_threshold'])
+    margins[..., 2] = np.minimum(np.minimum(angry['eyebrow_distance_threshold'] - eyebrow_distance,
+                                            eyebrow_height - angry['eyebrow_height_threshold']),
+                                 angry['eye_openness_threshold'] - avg_ear)
+    return margins
@@ -0,0 +1,297 @@
+"""
+Rekam dan putar ulang landmark Face Mesh
+
+`record` menjalankan detektor MediaPipe pada video dan menyimpan
+`multi_face_landmarks` setiap panggilan face mesh ke file .npz. `bench`
+memutar ulang rekaman itu lewat ReplayFaceMesh, pengganti FaceMesh yang
+disuntikkan ke FaceExpressionDetector/SimpleFaceExpressionDetector, sehingga
+semua tahap setelah face mesh (konversi landmark, fitur, bounding box,
+klasifikasi, menggambar) bisa di-benchmark dan diuji regresi secara
+deterministik secepat mungkin, tanpa MediaPipe terinstall.
+
+Contoh:
+    python landmark_replay.py record rekaman.mp4 -o landmark.npz
+    python landmark_replay.py bench landmark.npz --repeat 10 --draw
+    python landmark_replay.py bench landmark.npz -o hasil.jsonl   # bandingkan dengan diff
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from instrumentation import StageTimer
+
+# Isi file rekaman
+_FACE_COUNTS = 'face_counts'      # (frames,) jumlah wajah per panggilan process()
+_SHAPES = 'shapes'                # (frames, 3) shape gambar RGB yang diproses
+_LANDMARK_COUNTS = 'landmark_counts'  # (faces,) jumlah landmark per wajah (468/478)
+_LANDMARKS = 'landmarks'          # (faces, n, 3) float32, x/y/z ternormalisasi
+_OPTIONS = 'options'              # JSON pengaturan face mesh saat merekam
+
+
+class ReplayLandmark:
+    """Pengganti NormalizedLandmark (atribut x, y, z)"""
+
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def HasField(self, name):
+        # drawing_utils MediaPipe memeriksa visibility/presence
+        return False
+
+
+class ReplayLandmarkList:
+    """Pengganti NormalizedLandmarkList (atribut landmark)"""
+
+    __slots__ = ('landmark',)
+
+    def __init__(self, points):
+        self.landmark = [ReplayLandmark(x, y, z) for x, y, z in points.tolist()]
+
+
+class ReplayResults:
+    __slots__ = ('multi_face_landmarks',)
+
+    def __init__(self, multi_face_landmarks):
+        self.multi_face_landmarks = multi_face_landmarks
+
+
+class LandmarkRecorder:
+    """Kumpulkan multi_face_landmarks setiap panggilan face mesh lalu simpan ke .npz"""
+
+    def __init__(self, path, options=None):
+        self.path = path
+        self.options = options or {}
+        self.face_counts = []
+        self.shapes = []
+        self.faces = []
+
+    def add(self, image_shape, multi_face_landmarks):
+        landmark_lists = multi_face_landmarks or []
+        self.face_counts.append(len(landmark_lists))
+        self.shapes.append(image_shape)
+        for landmarks in landmark_lists:
+            self.faces.append(np.array([(lm.x, lm.y, lm.z) for lm in landmarks.landmark], dtype=np.float32))
+
+    def save(self):
+        counts = np.array([len(points) for points in self.faces], dtype=np.int32)
+        n = int(counts.max()) if len(counts) else 0
+        landmarks = np.zeros((len(self.faces), n, 3), dtype=np.float32)
+        for i, points in enumerate(self.faces):
+            landmarks[i, :len(points)] = points
+        np.savez_compressed(
+            self.path,
+            **{_FACE_COUNTS: np.array(self.face_counts, dtype=np.int32),
+               _SHAPES: np.array(self.shapes, dtype=np.int32).reshape(-1, 3),
+               _LANDMARK_COUNTS: counts,
+               _LANDMARKS: landmarks,
+               _OPTIONS: np.array(json.dumps(self.options))})
+        return len(self.face_counts)
+
+
+class RecordingFaceMesh:
+    """Bungkus FaceMesh: hasil process() diteruskan apa adanya dan direkam"""
+
+    def __init__(self, face_mesh, recorder):
+        self.face_mesh = face_mesh
+        self.recorder = recorder
+
+    def process(self, image):
+        results = self.face_mesh.process(image)
+        self.recorder.add(image.shape, results.multi_face_landmarks)
+        return results
+
+    def close(self):
+        self.face_mesh.close()
+
+
+def recording_factory(recorder):
+    """face_mesh_factory untuk detektor yang merekam landmark dari MediaPipe FaceMesh"""
+    import mediapipe as mp
+
+    def create(**options):
+        recorder.options = options
+        return RecordingFaceMesh(mp.solutions.face_mesh.FaceMesh(**options), recorder)
+    return create
+
+
+def load_recording(path):
+    """Baca rekaman: (list multi_face_landmarks per frame, list shape, pengaturan)"""
+    with np.load(path) as data:
+        face_counts = data[_FACE_COUNTS]
+        shapes = [tuple(shape) for shape in data[_SHAPES].tolist()]
+        landmark_counts = data[_LANDMARK_COUNTS]
+        landmarks = data[_LANDMARKS]
+        options = json.loads(str(data[_OPTIONS]))
+
+    # Objek landmark dibuat sekali di sini agar replay tidak mengukur biaya pembuatannya
+    faces = [ReplayLandmarkList(points[:n]) for points, n in zip(landmarks, landmark_counts)]
+    frames = []
+    start = 0
+    for count in face_counts.tolist():
+        frames.append(faces[start:start + count] or None)
+        start += count
+    return frames, shapes, options
+
+
+class ReplayFaceMesh:
+    """Pengganti FaceMesh yang mengembalikan landmark rekaman, satu frame per process()"""
+
+    def __init__(self, frames, loop=False):
+        self.frames = frames
+        self.loop = loop
+        self.index = 0
+
+    @classmethod
+    def factory(cls, path, loop=False):
+        """face_mesh_factory untuk detektor; pengaturan face mesh diabaikan"""
+        frames, _, _ = load_recording(path)
+        return lambda **options: cls(frames, loop)
+
+    def process(self, image):
+        if self.index >= len(self.frames):
+            if not self.loop:
+                raise IndexError("Rekaman landmark sudah habis")
+            self.index = 0
+        results = ReplayResults(self.frames[self.index])
+        self.index += 1
+        return results
+
+    def close(self):
+        pass
+
+
+def create_replay_detector(path, simple=False, loop=False, **options):
+    """Detektor MediaPipe (main atau main_simple) yang memakai ReplayFaceMesh"""
+    if options.get('tracking'):
+        raise ValueError("Replay tidak mendukung ROI tracking (rekaman berisi frame penuh)")
+    if simple:
+        from main_simple import SimpleFaceExpressionDetector as detector_class
+    else:
+        from main import FaceExpressionDetector as detector_class
+
+    _, _, recorded = load_recording(path)
+    # max_num_faces dari rekaman agar buffer landmark cukup untuk semua wajah
+    options.setdefault('max_num_faces', recorded.get('max_num_faces', 1))
+    return detector_class(face_mesh_factory=ReplayFaceMesh.factory(path, loop), **options)
+
+
+def replay_frames(shapes):
+    """Frame BGR kosong berukuran sama dengan frame rekaman (satu array per ukuran)"""
+    blanks = {}
+    for shape in shapes:
+        frame = blanks.get(shape)
+        if frame is None:
+            frame = blanks[shape] = np.zeros(shape, dtype=np.uint8)
+        yield frame
+
+
+def record_video(video_path, output_path, simple=False, max_frames=None, **options):
+    """Jalankan detektor MediaPipe pada video dan rekam landmark setiap frame"""
+    import cv2
+
+    if simple:
+        from main_simple import SimpleFaceExpressionDetector as detector_class
+    else:
+        from main import FaceExpressionDetector as detector_class
+
+    recorder = LandmarkRecorder(output_path)
+    detector = detector_class(face_mesh_factory=recording_factory(recorder), **options)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Tidak dapat membuka video {video_path}")
+    try:
+        while max_frames is None or len(recorder.face_counts) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            detector.detect(frame)
+    finally:
+        cap.release()
+    return recorder.save()
+
+
+def benchmark(path, simple=False, repeat=1, draw=False, output=None):
+    """Putar ulang rekaman `repeat` kali; kembalikan statistik dan timing per tahap"""
+    _, shapes, _ = load_recording(path)
+    detector = create_replay_detector(path, simple, loop=True)
+    timer = detector.timer = StageTimer()
+
+    writer = None
+    if output:
+        from result_writer import ResultWriter
+        writer = ResultWriter(output)
+
+    frames = 0
+    start = time.perf_counter()
+    try:
+        for _ in range(repeat):
+            for index, frame in enumerate(replay_frames(shapes)):
+                faces = detector.detect(frame)
+                if draw:
+                    # Frame kosong yang sama dipakai ulang; isinya tidak memengaruhi hasil
+                    with timer.stage('drawing'):
+                        detector.draw_results(frame, faces)
+                if writer is not None:
+                    writer.write(faces, frame=index)
+                frames += 1
+            # Hasil hanya ditulis untuk putaran pertama
+            if writer is not None:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'frames': frames,
+        'seconds': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+        'stages': timer.summary(),
+        'counters': dict(timer.counters)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rekam dan putar ulang landmark Face Mesh")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="Rekam landmark dari video (butuh MediaPipe)")
+    record.add_argument('video', help="Path file video")
+    record.add_argument('-o', '--output', required=True, help="File rekaman .npz")
+    record.add_argument('--simple', action='store_true', help="Pakai SimpleFaceExpressionDetector")
+    record.add_argument('--max-frames', type=int, help="Batas jumlah frame")
+    record.add_argument('--max-faces', type=int, help="Jumlah wajah maksimum per frame")
+
+    bench = commands.add_parser('bench', help="Putar ulang rekaman secepat mungkin (tanpa MediaPipe)")
+    bench.add_argument('recording', help="File rekaman .npz")
+    bench.add_argument('--simple', action='store_true', help="Pakai SimpleFaceExpressionDetector")
+    bench.add_argument('--repeat', type=int, default=1, help="Jumlah putaran rekaman")
+    bench.add_argument('--draw', action='store_true', help="Ikut ukur tahap menggambar")
+    bench.add_argument('-o', '--output', help="Tulis hasil putaran pertama ke .jsonl/.csv (uji regresi)")
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        options = {'max_num_faces': args.max_faces} if args.max_faces else {}
+        count = record_video(args.video, args.output, args.simple, args.max_frames, **options)
+        print(f"{count} frame direkam -> {args.output}")
+        return
+
+    stats = benchmark(args.recording, args.simple, args.repeat, args.draw, args.output)
+    print(f"Replay: {stats['frames']} frame dalam {stats['seconds']:.3f} s ({stats['fps']:.1f} FPS)")
+    for stage, summary in stats['stages'].items():
+        if summary['count']:
+            print(f"  {stage:<15} mean {summary['mean_ms']:.4f} ms  p95 {summary['p95_ms']:.4f} ms")
+    if args.output:
+        print(f"Hasil disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Basis detektor ekspresi berbasis MediaPipe Face Mesh
+
+Jalur inferensi (konversi input, ROI tracking, cache landmark, fitur,
+klasifikasi), renderer dan loop webcam dipakai bersama oleh
+FaceExpressionDetector (main.py) dan SimpleFaceExpressionDetector
+(main_simple.py). Subclass hanya menentukan label, threshold dan tampilan.
+"""
+import cv2
+try:
+    import mediapipe as mp
+except ImportError:
+    # Without MediaPipe only an injected face mesh (e.g. landmark_replay.py) can be used
+    mp = None
+import numpy as np
+
+from config import WEBCAM_CONFIG, MEDIAPIPE_CONFIG, EXPRESSION_THRESHOLDS
+from landmark_features import (LandmarkBuffer, compute_features, bounding_boxes,
+                               extract_features_batch, classify_features, expression_margins)
+from buffer_pool import BufferPool
+from detection_result import FaceResult
+from landmark_cache import cache_key
+from instrumentation import NULL_TIMER, PerformanceOverlay
+from motion_gate import GatedDetector
+from pipeline import run_pipeline, print_pipeline_stats
+from quality_control import AdaptiveDetector
+from rendering import MeshRenderer, guide_overlay
+from roi_tracking import RoiTracker, to_frame_coords
+
+
+class MeshExpressionDetector:
+    """Detektor Face Mesh; subclass mengatur atribut kelas di bawah ini"""
+
+    # Expression labels, indexed by expression code
+    expression_labels = ['Neutral', 'Senang', 'Sedih', 'Marah']
+    thresholds = EXPRESSION_THRESHOLDS
+    # MeshRenderer options and guide text shown in the webcam window
+    renderer_options = {}
+    guide_lines = []
+    window_name = 'Face Expression Detection'
+
+    def __init__(self, tracking=False, cache=None, face_mesh_factory=None, **face_mesh_options):
+        # Face mesh constructor: MediaPipe FaceMesh unless another implementation
+        # with process()/close() is injected (landmark recording/replay)
+        if face_mesh_factory is None:
+            if mp is None:
+                raise ImportError("MediaPipe tidak terinstall (pip install mediapipe)")
+            face_mesh_factory = mp.solutions.face_mesh.FaceMesh
+        self.face_mesh_factory = face_mesh_factory
+
+        # Face mesh options (defaults from MEDIAPIPE_CONFIG, overridable per instance),
+        # validated before any graph is built so a rejected combination leaks nothing
+        self.face_mesh_options = dict(MEDIAPIPE_CONFIG)
+        self.face_mesh_options.update(face_mesh_options)
+
+        # The ROI crop follows a single face, so it would hide any other face
+        if tracking and self.face_mesh_options['max_num_faces'] > 1:
+            raise ValueError("ROI tracking hanya mendukung max_num_faces=1")
+
+        # Optional landmark cache (landmark_cache.LandmarkCache); only still images
+        # give landmarks that depend on the image content alone
+        if cache is not None and not self.face_mesh_options['static_image_mode']:
+            raise ValueError("Cache landmark hanya untuk static_image_mode=True")
+        self.cache = cache
+
+        # Initialize face mesh
+        self.face_mesh = self.face_mesh_factory(**self.face_mesh_options)
+
+        # Quality knobs (adjusted at runtime by quality_control.AdaptiveDetector)
+        self.input_scale = 1.0
+
+        # Per-stage timing hook (no-op unless replaced with instrumentation.StageTimer)
+        self.timer = NULL_TIMER
+
+        # Reused destinations for resize and color conversion (no per-frame allocation)
+        self.buffers = BufferPool()
+
+        # Optional ROI tracking around the previous frame's face box; crops get their own
+        # face mesh so its internal tracking state stays in crop coordinates
+        self.roi_tracker = RoiTracker() if tracking else None
+        self.roi_face_mesh = self.face_mesh_factory(**self.face_mesh_options) if tracking else None
+
+        # Preallocated float32 buffer reused for the landmarks of every face and frame
+        # (with z when landmarks are cached, so cached entries can be drawn later)
+        self.landmark_buffer = LandmarkBuffer(self.face_mesh_options['max_num_faces'],
+                                              dims=2 if cache is None else 3)
+
+        # Drawing is optional: detect() never touches the frame
+        self.renderer = MeshRenderer(self.expression_labels, **self.renderer_options)
+        self.guide_overlay = guide_overlay(self.guide_lines)
+
+    def set_refine_landmarks(self, refine):
+        """Rebuild the face mesh with iris refinement turned on or off"""
+        if self.face_mesh_options['refine_landmarks'] == refine:
+            return
+        self.face_mesh.close()
+        self.face_mesh_options['refine_landmarks'] = refine
+        self.face_mesh = self.face_mesh_factory(**self.face_mesh_options)
+        if self.roi_face_mesh is not None:
+            self.roi_face_mesh.close()
+            self.roi_face_mesh = self.face_mesh_factory(**self.face_mesh_options)
+
+    def close(self):
+        """Release the face mesh graph(s)"""
+        self.face_mesh.close()
+        if self.roi_face_mesh is not None:
+            self.roi_face_mesh.close()
+
+    def extract_features(self, landmarks):
+        """Extract facial features for expression classification"""
+        if not landmarks:
+            return None
+
+        # Fill the reusable landmark buffer and compute all features on it
+        points = self.landmark_buffer.fill(landmarks)
+        return compute_features(points)
+
+    def classify_expression(self, features):
+        """Rule-based expression classification of one feature vector (label string)"""
+        if features is None or len(features) < 7:
+            return "Tidak Terdeteksi"
+        # Same rules as the batch classifier (thresholds from config.py)
+        return self.expression_labels[int(classify_features(features, self.thresholds))]
+
+    def extract_features_batch(self, points):
+        """Extract features for a batch of landmark arrays (N, 478, 2|3) -> (N, 7)"""
+        return extract_features_batch(points)
+
+    def classify_expression_batch(self, features):
+        """Classify a (N, 7) feature matrix into expression codes (index into expression_labels)"""
+        return classify_features(features, self.thresholds)
+
+    def draw_landmarks(self, image, landmarks):
+        """Draw face landmarks on image"""
+        self.renderer.draw_landmarks(image, landmarks)
+
+    def prepare_input(self, frame, region=None):
+        """Crop (optional), downscale and convert a BGR frame to RGB for the face mesh"""
+        scale = self.input_scale
+        if region is not None:
+            x0, y0, x1, y1 = region
+            frame = frame[y0:y1, x0:x1]
+            scale *= self.roi_tracker.input_scale(region)
+
+        # Landmarks are normalized, so bboxes are still computed in full-frame pixels
+        if scale != 1.0:
+            h, w = frame.shape[:2]
+            size = (max(1, round(w * scale)), max(1, round(h * scale)))
+            resized = self.buffers.get((size[1], size[0], 3), name='resize')
+            frame = cv2.resize(frame, size, dst=resized, interpolation=cv2.INTER_LINEAR)
+
+        # Convert BGR to RGB into a pooled buffer, marked read-only so MediaPipe
+        # can wrap it without copying
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.buffers.get(frame.shape, name='rgb'))
+        rgb_frame.flags.writeable = False
+        return rgb_frame
+
+    def detect(self, frame):
+        """Detect faces and classify expressions without drawing on the frame (list of FaceResult)"""
+        h, w, _ = frame.shape
+
+        timer = self.timer
+
+        # Cached landmarks skip the face mesh entirely
+        key = cached = None
+        if self.cache is not None:
+            with timer.stage('cache'):
+                key = cache_key(frame, dict(self.face_mesh_options, input_scale=self.input_scale))
+                cached = self.cache.get(key)
+
+        region = None
+        if cached is not None:
+            landmark_lists = cached
+        else:
+            # Tracking mode: run the face mesh on a crop around the previous face
+            region = self.roi_tracker.region(w, h) if self.roi_tracker else None
+            if region is not None:
+                with timer.stage('conversion'):
+                    rgb_frame = self.prepare_input(frame, region)
+                with timer.stage('mesh'):
+                    results = self.roi_face_mesh.process(rgb_frame)
+                if results.multi_face_landmarks:
+                    self.roi_tracker.hits += 1
+                else:
+                    # Face lost inside the crop: fall back to full-frame detection
+                    self.roi_tracker.misses += 1
+                    region = None
+            if region is None:
+                with timer.stage('conversion'):
+                    rgb_frame = self.prepare_input(frame)
+                with timer.stage('mesh'):
+                    results = self.face_mesh.process(rgb_frame)
+            landmark_lists = results.multi_face_landmarks or []
+
+        faces = []
+        points = cached
+        if len(landmark_lists):
+            # All faces stacked into one (F, n, 2|3) array: features, boxes and
+            # classification come from single vectorized operations
+            with timer.stage('features'):
+                if points is None:
+                    points = self.landmark_buffer.fill_all(landmark_lists)
+                    if region is not None:
+                        to_frame_coords(points, region, w, h)
+                features = compute_features(points)
+                bboxes = bounding_boxes(points, w, h).tolist()
+            with timer.stage('classification'):
+                codes = classify_features(features, self.thresholds).tolist()
+                margins = expression_margins(features, self.thresholds)
+
+            # Cached faces keep their landmarks as arrays; the renderer draws arrays directly
+            faces = [FaceResult(tuple(bbox), code, face_features, face_margins, face_landmarks, region)
+                     for bbox, code, face_features, face_margins, face_landmarks
+                     in zip(bboxes, codes, features, margins, landmark_lists)]
+
+        if key is not None and cached is None:
+            self.cache.put(key, points if points is not None else np.zeros((0, 0, 3), dtype=np.float32))
+
+        if self.roi_tracker:
+            self.roi_tracker.update(faces[0].bbox if faces else None)
+
+        timer.count_frame(len(faces))
+        return faces
+
+    def draw_results(self, frame, faces):
+        """Draw landmarks, bounding box and expression label; returns (frame, expression label)"""
+        return self.renderer.draw(frame, faces)
+
+    def process_frame(self, frame):
+        """Process a single frame"""
+        timer = self.timer
+        with timer.stage('total'):
+            faces = self.detect(frame)
+            with timer.stage('drawing'):
+                result = self.draw_results(frame, faces)
+        return result
+
+    def show_frame(self, processed_frame, expression):
+        """Render stage: draw instructions and display the frame; returns False when 'q' is pressed"""
+        # Add instructions and guide (pre-rendered once, copied in a single operation)
+        self.guide_overlay.apply(processed_frame)
+
+        # Display frame
+        cv2.imshow(self.window_name, processed_frame)
+
+        # Break on 'q' key press
+        return cv2.waitKey(1) & 0xFF != ord('q')
+
+    def run_webcam(self, source=0, threaded=False, adaptive=False, overlay=None, motion_gate=False):
+        """Run face detection on webcam (or any VideoCapture source)"""
+        cap = cv2.VideoCapture(source)
+
+        if not cap.isOpened():
+            print("Error: Tidak dapat mengakses webcam")
+            return
+
+        # Set webcam resolution (WEBCAM_CONFIG)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, WEBCAM_CONFIG['width'])
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, WEBCAM_CONFIG['height'])
+
+        print("Memulai deteksi wajah... Tekan 'q' untuk keluar")
+
+        # Optionally degrade quality under load to hold the per-frame latency budget
+        process_frame = AdaptiveDetector(self).process_frame if adaptive else self.process_frame
+        # Or skip inference while a fixed camera sees an unchanged scene
+        if motion_gate and not adaptive:
+            process_frame = GatedDetector(self).process_frame
+        if WEBCAM_CONFIG['show_performance'] if overlay is None else overlay:
+            process_frame = PerformanceOverlay(process_frame)
+
+        if threaded:
+            # Capture, inference and render run as separate pipeline stages
+            stats = run_pipeline(cap, process_frame, self.show_frame)
+            print_pipeline_stats(stats)
+        else:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    print("Error: Tidak dapat membaca frame dari webcam")
+                    break
+
+                # Process frame
+                processed_frame, expression = process_frame(frame)
+
+                if not self.show_frame(processed_frame, expression):
+                    break
+
+        cap.release()
+        cv2.destroyAllWindows()
+
+    def process_image(self, image_path):
+        """Process a single image"""
+        image = cv2.imread(image_path)
+        if image is None:
+            print(f"Error: Tidak dapat membaca gambar {image_path}")
+            return
+
+        processed_image, expression = self.process_frame(image)
+
+        print(f"Ekspresi terdeteksi: {expression}")
+
+        # Display image
+        cv2.imshow(self.window_name, processed_image)
+        print("Tekan sembarang tombol untuk menutup...")
+        cv2.waitKey(0)
+        cv2.destroyAllWindows()
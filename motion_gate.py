@@ -0,0 +1,158 @@
+"""
+Gerbang perubahan frame sebelum inferensi
+
+Kamera statis sering menampilkan adegan yang tidak berubah dalam waktu lama.
+MotionGate membandingkan thumbnail grayscale kecil frame saat ini dengan
+thumbnail frame terakhir yang diproses (selisih rata-rata atau dHash); jika
+perubahannya di bawah threshold, hasil deteksi terakhir dipakai ulang.
+Setelah wajah terdeteksi, perbandingan hanya dilakukan di sekitar bounding box
+wajah (`track()`), sehingga wajah kecil yang bergerak tidak tenggelam dalam
+rata-rata seluruh frame. Inferensi penuh tetap dipaksa setiap
+`refresh_interval` frame.
+"""
+import cv2
+import numpy as np
+
+from config import MOTION_GATE_CONFIG
+
+METHODS = ('diff', 'dhash')
+
+
+class MotionGate:
+    """Putuskan apakah frame cukup berubah untuk dijalankan inferensi"""
+
+    def __init__(self, method=None, threshold=None, refresh_interval=None, thumbnail_size=None,
+                 region_padding=None):
+        config = MOTION_GATE_CONFIG
+        self.method = method or config['method']
+        if self.method not in METHODS:
+            raise ValueError(f"Metode gate tidak dikenal: {self.method} (pilihan: {', '.join(METHODS)})")
+        if threshold is None:
+            threshold = config['diff_threshold' if self.method == 'diff' else 'hash_threshold']
+        self.threshold = threshold
+        self.refresh_interval = refresh_interval or config['refresh_interval']
+        # dHash membandingkan piksel bertetangga pada thumbnail 9x8 (64 bit)
+        self.thumbnail_size = (9, 8) if self.method == 'dhash' else (thumbnail_size or config['thumbnail_size'])
+        self.region_padding = config['region_padding'] if region_padding is None else region_padding
+
+        # Region (x0, y0, x1, y1) yang dibandingkan; None = seluruh frame
+        self.region = None
+        self.reference = None
+        self.since_refresh = 0
+        self.last_score = 0.0
+        self.checks = 0
+        self.skips = 0
+
+    def thumbnail(self, frame):
+        if self.region is not None:
+            x0, y0, x1, y1 = self.region
+            frame = frame[y0:y1, x0:x1]
+        small = cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def signature(self, frame):
+        """Thumbnail (metode diff) atau bit dHash yang dibandingkan antar frame"""
+        thumbnail = self.thumbnail(frame)
+        if self.method == 'dhash':
+            return thumbnail[:, 1:] > thumbnail[:, :-1]
+        return thumbnail
+
+    def score(self, thumbnail):
+        """Besar perubahan terhadap thumbnail referensi (satuan sesuai metode)"""
+        if self.method == 'dhash':
+            return int(np.count_nonzero(thumbnail != self.reference))
+        return float(cv2.absdiff(thumbnail, self.reference).mean()) / 255.0
+
+    def changed(self, frame):
+        """True jika inferensi perlu dijalankan untuk frame ini"""
+        self.checks += 1
+        thumbnail = self.signature(frame)
+
+        if self.reference is not None and self.since_refresh < self.refresh_interval - 1:
+            self.last_score = self.score(thumbnail)
+            if self.last_score < self.threshold:
+                self.since_refresh += 1
+                self.skips += 1
+                return False
+
+        # Referensi adalah frame terakhir yang diproses, sehingga perubahan
+        # perlahan tetap terakumulasi sampai melewati threshold
+        self.reference = thumbnail
+        self.since_refresh = 0
+        return True
+
+    def track(self, frame, bbox):
+        """Batasi perbandingan ke `bbox` (+padding) dari frame yang baru diproses
+
+        Dipanggil setelah inferensi; bbox None (tidak ada wajah) kembali ke seluruh frame.
+        """
+        region = None
+        if bbox is not None:
+            h, w = frame.shape[:2]
+            x_min, y_min, x_max, y_max = bbox
+            pad_x = int((x_max - x_min) * self.region_padding)
+            pad_y = int((y_max - y_min) * self.region_padding)
+            x0, y0 = max(0, x_min - pad_x), max(0, y_min - pad_y)
+            x1, y1 = min(w, x_max + pad_x), min(h, y_max + pad_y)
+            if x1 - x0 >= 2 and y1 - y0 >= 2:
+                region = (x0, y0, x1, y1)
+        if region != self.region:
+            self.region = region
+            self.reference = self.signature(frame)
+
+    @property
+    def skip_rate(self):
+        return self.skips / self.checks if self.checks else 0.0
+
+    def reset(self):
+        self.region = None
+        self.reference = None
+        self.since_refresh = 0
+
+
+def faces_bbox(faces):
+    """Bounding box gabungan semua wajah (FaceResult), None jika tidak ada wajah"""
+    if not faces:
+        return None
+    boxes = [face.bbox for face in faces]
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+class GatedDetector:
+    """Bungkus detektor: detect() memakai ulang hasil terakhir jika frame tidak berubah"""
+
+    def __init__(self, detector, gate=None):
+        self.detector = detector
+        self.gate = gate or MotionGate()
+        self.last_faces = None
+
+    @property
+    def timer(self):
+        return self.detector.timer
+
+    def detect(self, frame):
+        timer = self.detector.timer
+        with timer.stage('gate'):
+            changed = self.gate.changed(frame) or self.last_faces is None
+        if changed:
+            self.last_faces = self.detector.detect(frame)
+            with timer.stage('gate_track'):
+                self.gate.track(frame, faces_bbox(self.last_faces))
+        else:
+            # Frame yang dilewati tetap dihitung agar skipped_frames / frames = skip rate
+            timer.count('skipped_frames')
+            timer.count_frame(len(self.last_faces))
+        return self.last_faces
+
+    def draw_results(self, frame, faces):
+        return self.detector.draw_results(frame, faces)
+
+    def process_frame(self, frame):
+        """Process a frame, reusing the last result while the scene is unchanged"""
+        timer = self.detector.timer
+        with timer.stage('total'):
+            faces = self.detect(frame)
+            with timer.stage('drawing'):
+                result = self.draw_results(frame, faces)
+        return result
@@ -0,0 +1,261 @@
+"""
+Runner asyncio untuk banyak sumber video sekaligus
+
+Setiap sumber (file, index webcam, URL) dibaca oleh task-nya sendiri, frame
+diteruskan lewat queue terbatas per stream ke sekumpulan detektor yang
+dijalankan di thread pool berukuran tetap. Hasil setiap stream masuk ke queue
+hasilnya sendiri. Backpressure per stream, untuk frame maupun hasil: file yang
+tidak diputar real-time menunggu (tanpa frame/hasil hilang), sumber live atau
+mode real-time membuang yang tertua. Error pada satu stream tidak menghentikan
+stream lain.
+
+Contoh (uji lokal dengan beberapa file video pada frame rate aslinya):
+    python multi_stream.py a.mp4 b.mp4 c.mp4 --realtime --backend haar --workers 2 -o hasil.jsonl
+    python multi_stream.py 0 rtsp://kamera/lobby --backend mediapipe --max-frames 300
+"""
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from backends import BACKENDS, create_detector
+from config import DEFAULT_BACKEND
+from motion_gate import MotionGate, faces_bbox
+
+# Penanda akhir stream antar tahap
+_END = object()
+
+
+def parse_source(source):
+    """Index webcam ('0') menjadi int, selain itu path/URL apa adanya"""
+    return int(source) if str(source).isdigit() else source
+
+
+class Stream:
+    """State satu sumber video: queue frame, queue hasil dan statistik"""
+
+    def __init__(self, source, name=None, queue_size=2, realtime=False, max_frames=None, gate=None):
+        self.source = parse_source(source)
+        self.name = name or str(source)
+        self.realtime = realtime
+        self.max_frames = max_frames
+        # File yang tidak diputar real-time boleh menahan pembaca; selain itu frame lama dibuang
+        self.drop_oldest = realtime or not (isinstance(self.source, str) and os.path.isfile(self.source))
+        self.queue_size = queue_size
+        # Queue dibuat oleh open_queues() di dalam event loop yang menjalankannya
+        # (Python <= 3.9 mengikat asyncio.Queue ke loop saat dibuat)
+        self.frames = None
+        self.results = None
+        self.counts = {'read': 0, 'inferred': 0, 'skipped': 0, 'dropped': 0, 'results_dropped': 0}
+        # MotionGate opsional: frame yang tidak berubah memakai ulang hasil terakhir
+        self.gate = gate
+        self.last_faces = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    def open_queues(self):
+        self.frames = asyncio.Queue(self.queue_size)
+        self.results = asyncio.Queue(self.queue_size)
+
+    async def put_frame(self, item):
+        if self.drop_oldest and self.frames.full():
+            self.frames.get_nowait()
+            self.counts['dropped'] += 1
+        await self.frames.put(item)
+
+    async def put_result(self, item):
+        if self.drop_oldest and self.results.full():
+            self.results.get_nowait()
+            self.counts['results_dropped'] += 1
+        await self.results.put(item)
+
+    def stats(self):
+        elapsed = (self.finished or time.perf_counter()) - (self.started or time.perf_counter())
+        return {
+            'source': str(self.source),
+            'counts': dict(self.counts),
+            'inference_fps': round(self.counts['inferred'] / elapsed, 2) if elapsed > 0 else 0.0,
+            'skip_rate': round(self.gate.skip_rate, 4) if self.gate is not None else None,
+            'error': None if self.error is None else repr(self.error)
+        }
+
+
+class MultiStreamRunner:
+    """Jalankan deteksi untuk banyak stream dengan `workers` instance detektor bersama"""
+
+    def __init__(self, sources, backend='haar', workers=2, queue_size=2, realtime=False,
+                 max_frames=None, motion_gate=False, **detector_options):
+        # Nama diawali index agar sumber yang sama (atau nama file kembar) tetap unik
+        self.streams = [Stream(source, f'{index}:{source}', queue_size, realtime, max_frames,
+                               MotionGate() if motion_gate else None)
+                        for index, source in enumerate(sources)]
+        self.backend = backend
+        self.workers = workers
+        # Detektor dipakai bergantian oleh banyak stream, jadi tracking video
+        # MediaPipe dimatikan (setiap frame diproses sebagai gambar)
+        if backend != 'haar':
+            detector_options.setdefault('static_image_mode', True)
+        self.detector_options = detector_options
+
+    async def _read(self, stream):
+        loop = asyncio.get_running_loop()
+        # Satu thread per sumber: read() dan release() VideoCapture tidak pernah berjalan bersamaan
+        executor = ThreadPoolExecutor(1, thread_name_prefix='capture')
+        cap = None
+        try:
+            cap = await loop.run_in_executor(executor, cv2.VideoCapture, stream.source)
+            if not cap.isOpened():
+                raise IOError(f"Tidak dapat membuka sumber {stream.source}")
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            stream.started = time.perf_counter()
+            index = 0
+            while stream.max_frames is None or index < stream.max_frames:
+                if stream.realtime:
+                    # Putar file sesuai frame rate aslinya
+                    delay = stream.started + index / fps - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                ret, frame = await loop.run_in_executor(executor, cap.read)
+                if not ret:
+                    break
+                stream.counts['read'] += 1
+                await stream.put_frame((index, index / fps, frame))
+                index += 1
+            await stream.frames.put(_END)
+        finally:
+            # Dijalankan setelah read() yang mungkin masih berjalan saat task dibatalkan
+            if cap is not None:
+                executor.submit(cap.release)
+            executor.shutdown(wait=False)
+
+    async def _infer(self, stream, detectors, executor):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await stream.frames.get()
+            if item is _END:
+                break
+            index, timestamp, frame = item
+            gate = stream.gate
+            changed = True
+            if gate is not None:
+                # Perbandingan thumbnail (numpy) dijalankan di luar thread event loop
+                changed = await loop.run_in_executor(None, gate.changed, frame) or stream.last_faces is None
+            if not changed:
+                # Adegan tidak berubah: tidak perlu meminjam detektor
+                stream.counts['skipped'] += 1
+                await stream.put_result((index, timestamp, stream.last_faces))
+                continue
+            detector = await detectors.get()
+            future = executor.submit(self._detect, detector, frame, gate)
+            # Detektor baru dikembalikan ke pool setelah detect() benar-benar selesai,
+            # walaupun task stream ini dibatalkan lebih dulu
+            future.add_done_callback(
+                lambda _, detector=detector: loop.call_soon_threadsafe(detectors.put_nowait, detector))
+            faces = await asyncio.wrap_future(future)
+            stream.counts['inferred'] += 1
+            stream.last_faces = faces
+            await stream.put_result((index, timestamp, faces))
+
+    @staticmethod
+    def _detect(detector, frame, gate):
+        """Inferensi (thread pool); region motion gate ikut diperbarui di thread yang sama"""
+        faces = detector.detect(frame)
+        if gate is not None:
+            gate.track(frame, faces_bbox(faces))
+        return faces
+
+    async def _run_stream(self, stream, detectors, executor):
+        """Tahap baca dan inferensi satu stream; error hanya menghentikan stream ini"""
+        reader = asyncio.create_task(self._read(stream))
+        inference = asyncio.create_task(self._infer(stream, detectors, executor))
+        try:
+            await asyncio.gather(reader, inference)
+        except Exception as e:
+            stream.error = e
+            reader.cancel()
+            inference.cancel()
+        finally:
+            stream.finished = time.perf_counter()
+            await stream.put_result(_END)
+
+    async def _consume(self, stream, on_result):
+        while True:
+            item = await stream.results.get()
+            if item is _END:
+                return
+            if on_result is not None:
+                on_result(stream, *item)
+
+    async def run(self, on_result=None):
+        """Proses semua stream sampai selesai; `on_result(stream, index, timestamp, faces)`"""
+        loop = asyncio.get_running_loop()
+        for stream in self.streams:
+            stream.open_queues()
+        executor = ThreadPoolExecutor(self.workers, thread_name_prefix='inference')
+        try:
+            detectors = asyncio.Queue()
+            for _ in range(self.workers):
+                detector = await loop.run_in_executor(
+                    executor, lambda: create_detector(self.backend, **self.detector_options))
+                detectors.put_nowait(detector)
+
+            await asyncio.gather(*(
+                task
+                for stream in self.streams
+                for task in (self._run_stream(stream, detectors, executor),
+                             self._consume(stream, on_result))
+            ))
+        finally:
+            executor.shutdown(wait=True)
+        return {stream.name: stream.stats() for stream in self.streams}
+
+
+def run_streams(runner, output=None, fmt=None):
+    """Jalankan runner; hasil semua stream (opsional) ditulis ke satu file"""
+    writer = None
+    if output:
+        from result_writer import ResultWriter
+        writer = ResultWriter(output, fmt)
+
+    def on_result(stream, index, timestamp, faces):
+        if writer is not None:
+            writer.write(faces, stream=stream.name, frame=index, timestamp=round(timestamp, 3))
+
+    try:
+        stats = asyncio.run(runner.run(on_result))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    for name, stream_stats in stats.items():
+        counts = stream_stats['counts']
+        status = f"GAGAL: {stream_stats['error']}" if stream_stats['error'] else "selesai"
+        print(f"[{name}] {status} - dibaca {counts['read']}, diproses {counts['inferred']}, "
+              f"dilewati {counts['skipped']}, dibuang {counts['dropped']}, {stream_stats['inference_fps']} FPS")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deteksi ekspresi untuk banyak sumber video sekaligus")
+    parser.add_argument('sources', nargs='+', help="File video, index webcam atau URL stream")
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument('--workers', type=int, default=2, help="Jumlah instance detektor (thread inferensi)")
+    parser.add_argument('--queue-size', type=int, default=2, help="Ukuran queue frame/hasil per stream")
+    parser.add_argument('--realtime', action='store_true', help="Putar file video sesuai frame rate aslinya")
+    parser.add_argument('--max-frames', type=int, help="Batas frame per stream")
+    parser.add_argument('--motion-gate', action='store_true',
+                        help="Lewati inferensi pada frame yang hampir tidak berubah (per stream)")
+    parser.add_argument('-o', '--output', help="Tulis hasil semua stream ke file .jsonl/.csv")
+    args = parser.parse_args()
+
+    runner = MultiStreamRunner(args.sources, args.backend, args.workers, args.queue_size,
+                               args.realtime, args.max_frames, args.motion_gate)
+    run_streams(runner, args.output)
+
+
+if __name__ == "__main__":
+    main()
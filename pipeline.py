@@ -0,0 +1,187 @@
+"""
+Pipeline capture / inferensi / render berbasis thread
+
+Capture dan inferensi masing-masing berjalan di thread sendiri, render berjalan
+di thread pemanggil (cv2.imshow harus di main thread). Antar tahap dihubungkan
+queue terbatas. Untuk sumber live (webcam, URL) kebijakannya drop-oldest
+sehingga inferensi selalu memakai frame terbaru; file video menunggu tahap
+berikutnya sehingga tidak ada frame yang hilang.
+"""
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+# Penanda akhir stream antar tahap
+_END = object()
+
+
+class DropOldestQueue:
+    """Queue terbatas yang membuang item tertua saat penuh"""
+
+    def __init__(self, maxsize=1):
+        self.queue = queue.Queue(maxsize)
+        self.dropped = 0
+        self.max_depth = 0
+        self._lock = threading.Lock()
+
+    def put(self, item):
+        with self._lock:
+            while True:
+                try:
+                    self.queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def put_wait(self, item, stop_event):
+        """Tunggu sampai ada tempat (tanpa membuang item); False jika pipeline dihentikan"""
+        while not stop_event.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            with self._lock:
+                self.max_depth = max(self.max_depth, self.queue.qsize())
+            return True
+        return False
+
+    def get(self, timeout=None):
+        return self.queue.get(timeout=timeout)
+
+    def qsize(self):
+        return self.queue.qsize()
+
+    def stats(self):
+        return {'depth': self.qsize(), 'max_depth': self.max_depth, 'dropped': self.dropped}
+
+
+class FramePipeline:
+    """Pipeline tiga tahap untuk sumber VideoCapture apa pun (webcam, file, URL)"""
+
+    def __init__(self, source, process_frame, queue_size=1, live=None):
+        # Default: hanya path file yang dianggap bukan live (VideoCapture dari pemanggil = webcam)
+        if live is None:
+            live = not (isinstance(source, str) and os.path.isfile(source))
+        self.live = live
+        if isinstance(source, cv2.VideoCapture):
+            self.cap = source
+            self.owns_capture = False
+        else:
+            self.cap = cv2.VideoCapture(source)
+            self.owns_capture = True
+
+        self.process_frame = process_frame
+        self.frame_queue = DropOldestQueue(queue_size)
+        self.result_queue = DropOldestQueue(queue_size)
+        self.stop_event = threading.Event()
+        self.counts = {'captured': 0, 'inferred': 0, 'rendered': 0}
+        self.inference_time = 0.0
+        self.threads = []
+
+    def _put(self, stage_queue, item):
+        if self.live:
+            stage_queue.put(item)
+        else:
+            stage_queue.put_wait(item, self.stop_event)
+
+    def _capture_loop(self):
+        index = 0
+        while not self.stop_event.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            self._put(self.frame_queue, (index, frame))
+            self.counts['captured'] += 1
+            index += 1
+        # Penanda akhir tidak boleh membuang frame terakhir yang masih di queue
+        self.frame_queue.put_wait(_END, self.stop_event)
+
+    def _inference_loop(self):
+        while True:
+            try:
+                item = self.frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    break
+                continue
+            if item is _END:
+                break
+
+            index, frame = item
+            start = time.perf_counter()
+            processed_frame, expression = self.process_frame(frame)
+            self.inference_time += time.perf_counter() - start
+            self.counts['inferred'] += 1
+            self._put(self.result_queue, (index, processed_frame, expression))
+        self.result_queue.put_wait(_END, self.stop_event)
+
+    def start(self):
+        if not self.cap.isOpened():
+            raise IOError("Tidak dapat membuka sumber video")
+        self.threads = [
+            threading.Thread(target=self._capture_loop, name='capture', daemon=True),
+            threading.Thread(target=self._inference_loop, name='inference', daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def results(self):
+        """Generator hasil inferensi (index, frame, ekspresi) untuk tahap render"""
+        while True:
+            try:
+                item = self.result_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    return
+                continue
+            if item is _END:
+                return
+            yield item
+            self.counts['rendered'] += 1
+
+    def stop(self):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join()
+        if self.owns_capture:
+            self.cap.release()
+
+    def stats(self):
+        inferred = self.counts['inferred']
+        return {
+            'counts': dict(self.counts),
+            'frame_queue': self.frame_queue.stats(),
+            'result_queue': self.result_queue.stats(),
+            'avg_inference_ms': 1000 * self.inference_time / inferred if inferred else 0.0
+        }
+
+
+def run_pipeline(source, process_frame, render, queue_size=1, live=None):
+    """Jalankan pipeline; `render(frame, expression)` mengembalikan False untuk berhenti"""
+    pipeline = FramePipeline(source, process_frame, queue_size, live)
+    pipeline.start()
+    try:
+        for _, frame, expression in pipeline.results():
+            if render(frame, expression) is False:
+                break
+    finally:
+        pipeline.stop()
+    return pipeline.stats()
+
+
+def print_pipeline_stats(stats):
+    """Tampilkan ringkasan kedalaman queue dan frame yang di-drop per tahap"""
+    counts = stats['counts']
+    print(f"Pipeline: capture={counts['captured']} inferensi={counts['inferred']} "
+          f"render={counts['rendered']} (rata-rata inferensi {stats['avg_inference_ms']:.1f} ms)")
+    for name in ('frame_queue', 'result_queue'):
+        q = stats[name]
+        print(f"  {name}: depth={q['depth']} max_depth={q['max_depth']} dropped={q['dropped']}")
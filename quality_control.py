@@ -0,0 +1,84 @@
+"""
+Kontrol kualitas adaptif untuk menjaga anggaran latensi per frame
+
+Controller memantau latensi process_frame. Jika rata-rata melewati anggaran,
+kualitas diturunkan bertahap: inferensi setiap frame ke-k (hasil terakhir
+dipakai ulang), iris refinement dimatikan, input diperkecil, lalu gambar
+landmark dilewati. Kualitas dinaikkan kembali saat latensi cukup longgar.
+"""
+import time
+from collections import deque
+
+from config import ADAPTIVE_QUALITY_CONFIG
+
+
+class AdaptiveQualityController:
+    """Pilih level kualitas berdasarkan rata-rata latensi frame terakhir"""
+
+    def __init__(self, latency_budget_ms=None, levels=None, window=None, restore_ratio=None):
+        config = ADAPTIVE_QUALITY_CONFIG
+        self.latency_budget_ms = latency_budget_ms or config['latency_budget_ms']
+        self.levels = levels or config['levels']
+        self.restore_ratio = restore_ratio or config['restore_ratio']
+        self.latencies = deque(maxlen=window or config['window'])
+        self.level = 0
+        self.changes = 0
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def record(self, latency_ms):
+        """Catat latensi satu frame; kembalikan True jika level berubah"""
+        self.latencies.append(latency_ms)
+        if len(self.latencies) < self.latencies.maxlen:
+            return False
+
+        average = sum(self.latencies) / len(self.latencies)
+        if average > self.latency_budget_ms and self.level < len(self.levels) - 1:
+            self.level += 1
+        elif average < self.latency_budget_ms * self.restore_ratio and self.level > 0:
+            self.level -= 1
+        else:
+            return False
+
+        # Mulai jendela baru agar efek level baru terukur sendiri
+        self.latencies.clear()
+        self.changes += 1
+        return True
+
+    def average_latency(self):
+        return sum(self.latencies) / len(self.latencies) if self.latencies else 0.0
+
+
+class AdaptiveDetector:
+    """Bungkus detektor MediaPipe agar process_frame mengikuti AdaptiveQualityController"""
+
+    def __init__(self, detector, controller=None):
+        self.detector = detector
+        self.controller = controller or AdaptiveQualityController()
+        self.base_refine = detector.face_mesh_options['refine_landmarks']
+        self.base_scale = detector.input_scale
+        self.frame_index = 0
+        self.last_faces = None
+        self._apply(self.controller.settings)
+
+    def _apply(self, settings):
+        self.detector.set_refine_landmarks(self.base_refine and settings['refine_landmarks'])
+        self.detector.input_scale = self.base_scale * settings['input_scale']
+        self.detector.renderer.draw_mesh = settings['draw_mesh']
+
+    def process_frame(self, frame):
+        """Process a frame, reusing the last result on skipped frames"""
+        start = time.perf_counter()
+
+        if self.last_faces is None or self.frame_index % self.controller.settings['frame_interval'] == 0:
+            self.last_faces = self.detector.detect(frame)
+        result = self.detector.draw_results(frame, self.last_faces)
+        self.frame_index += 1
+
+        if self.controller.record(1000 * (time.perf_counter() - start)):
+            self._apply(self.controller.settings)
+            # Hasil lama tidak dipakai setelah pengaturan berubah
+            self.last_faces = None
+        return result
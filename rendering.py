@@ -0,0 +1,219 @@
+"""
+Renderer untuk menggambar hasil deteksi (FaceResult) pada frame
+
+Detektor hanya menghasilkan FaceResult; renderer dipakai di mode tampilan
+(webcam/gambar) untuk menggambar landmark, kotak dan label ekspresi.
+Koneksi Face Mesh dikelompokkan per drawing spec sekali saja lalu digambar
+dengan cv2.polylines per kelompok, dan teks statis dirender sekali ke overlay.
+"""
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from face_mesh_connections import CONTOURS_STYLE, IRISES_STYLE
+from roi_tracking import to_frame_coords
+
+NO_FACE_LABEL = "Tidak Ada Wajah"
+
+# Teks instruksi jendela webcam (semua detektor)
+INSTRUCTION_TEXT = "Tekan 'q' untuk keluar"
+
+
+@lru_cache(maxsize=None)
+def connection_groups(name):
+    """Koneksi 'contours' atau 'irises' dikelompokkan per (warna, ketebalan), dibuat sekali
+
+    Hasilnya list (color, thickness, start_indices, end_indices). Tabel koneksi dan
+    warna diambil dari face_mesh_connections.py, jadi tidak membutuhkan MediaPipe.
+    """
+    style = CONTOURS_STYLE if name == 'contours' else IRISES_STYLE
+
+    groups = {}
+    for connections, color, thickness in style:
+        groups.setdefault((color, thickness), []).extend(connections)
+    return [(color, thickness, np.array([c[0] for c in connections]), np.array([c[1] for c in connections]))
+            for (color, thickness), connections in groups.items()]
+
+
+def landmark_pixels(landmarks, width, height, region=None):
+    """Koordinat piksel (n, 2) int32 dan mask landmark di dalam frame (n,)
+
+    `landmarks` berupa array (n, 2|3) atau NormalizedLandmarkList; landmark crop
+    ROI dipetakan dulu ke frame penuh. Pembulatan sama dengan drawing_utils MediaPipe.
+    """
+    if isinstance(landmarks, np.ndarray):
+        points = np.array(landmarks[:, :2], dtype=np.float64)
+    else:
+        landmark = landmarks.landmark
+        points = np.fromiter((v for lm in landmark for v in (lm.x, lm.y)),
+                             dtype=np.float64, count=2 * len(landmark)).reshape(-1, 2)
+    if region is not None:
+        to_frame_coords(points, region, width, height)
+
+    valid = ((points >= 0) & (points <= 1)).all(axis=1)
+    pixels = np.floor(points * (width, height))
+    np.minimum(pixels, (width - 1, height - 1), out=pixels)
+    return pixels.astype(np.int32), valid
+
+
+def draw_connections(image, pixels, valid, groups):
+    """Satu cv2.polylines per kelompok warna untuk semua segmen yang kedua ujungnya terlihat"""
+    for color, thickness, starts, ends in groups:
+        keep = valid[starts] & valid[ends]
+        segments = np.stack((pixels[starts[keep]], pixels[ends[keep]]), axis=1)
+        cv2.polylines(image, segments, False, color, thickness)
+
+
+class TextOverlay:
+    """Teks statis yang dirender sekali lalu disalin ke setiap frame dengan satu operasi
+
+    `items` berisi (text, origin, font_scale, color, thickness). Overlay dan
+    mask hanya sebesar kotak yang memuat semua teks, dibuat ulang per ukuran frame.
+    """
+
+    def __init__(self, items, font=cv2.FONT_HERSHEY_SIMPLEX):
+        self.items = items
+        self.font = font
+        self.cache = {}
+
+    def _render(self, shape):
+        h, w = shape[:2]
+        boxes = []
+        for text, (x, y), scale, _, thickness in self.items:
+            (text_w, text_h), baseline = cv2.getTextSize(text, self.font, scale, thickness)
+            boxes.append((x - thickness, y - text_h - thickness, x + text_w + thickness, y + baseline + thickness))
+        x0 = max(0, min(box[0] for box in boxes))
+        y0 = max(0, min(box[1] for box in boxes))
+        x1 = min(w, max(box[2] for box in boxes))
+        y1 = min(h, max(box[3] for box in boxes))
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        canvas = np.zeros((y1 - y0, x1 - x0) + shape[2:], dtype=np.uint8)
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for text, (x, y), scale, color, thickness in self.items:
+            origin = (x - x0, y - y0)
+            cv2.putText(canvas, text, origin, self.font, scale, color, thickness)
+            cv2.putText(mask, text, origin, self.font, scale, 255, thickness)
+        return (slice(y0, y1), slice(x0, x1)), canvas, mask
+
+    def apply(self, frame):
+        """Salin teks ke frame (in-place) dan kembalikan frame"""
+        shape = frame.shape
+        rendered = self.cache.get(shape)
+        if rendered is None and shape not in self.cache:
+            rendered = self.cache[shape] = self._render(shape)
+        if rendered is not None:
+            region, canvas, mask = rendered
+            cv2.copyTo(canvas, mask, frame[region])
+        return frame
+
+
+def guide_overlay(guide_lines, color=(255, 255, 255)):
+    """Overlay instruksi keluar + baris panduan di kiri atas jendela webcam"""
+    items = [(INSTRUCTION_TEXT, (10, 30), 0.7, color, 2)]
+    items += [(text, (10, 60 + i * 20), 0.4, color, 1) for i, text in enumerate(guide_lines)]
+    return TextOverlay(items)
+
+
+def draw_label(frame, label, origin, text_origin, box_height=None, font_scale=0.7, thickness=2):
+    """Teks label di atas kotak hitam; `origin` adalah pojok kiri atas kotak"""
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (text_width, text_height), _ = cv2.getTextSize(label, font, font_scale, thickness)
+    x, y = origin
+    box_height = box_height or text_height + 10
+    cv2.rectangle(frame, (x, y), (x + text_width + 10, y + box_height), (0, 0, 0), -1)
+    cv2.putText(frame, label, text_origin, font, font_scale, (0, 255, 0), thickness)
+
+
+class MeshRenderer:
+    """Renderer detektor MediaPipe: kontur Face Mesh, kotak wajah dan label"""
+
+    def __init__(self, labels, label_background=False, show_features=False):
+        # Tabel koneksi dibangun sekali, bukan setiap frame
+        self.contour_groups = connection_groups('contours')
+        self.iris_groups = connection_groups('irises')
+
+        self.labels = labels
+        self.label_background = label_background
+        self.show_features = show_features
+        # Dimatikan oleh kontrol kualitas adaptif saat beban tinggi
+        self.draw_mesh = True
+
+    def draw_landmarks(self, image, landmarks, region=None):
+        """Draw face contours (and irises) from a landmark array or NormalizedLandmarkList"""
+        if landmarks is None:
+            return
+        h, w = image.shape[:2]
+        pixels, valid = landmark_pixels(landmarks, w, h, region)
+        if len(pixels) == 0:
+            return
+        draw_connections(image, pixels, valid, self.contour_groups)
+
+        # Iris landmarks only exist with refine_landmarks
+        if len(pixels) > 468:
+            draw_connections(image, pixels, valid, self.iris_groups)
+
+    def draw(self, frame, faces):
+        """Draw every face; returns (frame, expression label of the first face)"""
+        for face in faces:
+            # Draw landmarks (crop landmarks are mapped to frame coordinates)
+            if self.draw_mesh:
+                self.draw_landmarks(frame, face.landmarks, face.region)
+
+            x_min, y_min, x_max, y_max = face.bbox
+
+            # Draw bounding box
+            cv2.rectangle(frame, (x_min - 20, y_min - 20), (x_max + 20, y_max + 20), (0, 255, 0), 2)
+
+            # Draw expression label
+            label = f'Ekspresi: {self.labels[face.code]}'
+            if self.label_background:
+                draw_label(frame, label, (x_min - 20, y_min - 50), (x_min - 15, y_min - 30))
+            else:
+                cv2.putText(frame, label, (x_min - 20, y_min - 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+
+        if not faces:
+            return frame, NO_FACE_LABEL
+
+        # Show features of the first face for debugging (optional)
+        features = faces[0].features
+        if self.show_features and features is not None:
+            h = frame.shape[0]
+            debug_text = f'EAR: {features[0]:.3f}, MAR: {features[2]:.3f}, Corner: {(features[4]+features[5])/2:.3f}'
+            cv2.putText(frame, debug_text, (10, h - 20),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+        return frame, self.labels[faces[0].code]
+
+
+class HaarRenderer:
+    """Renderer detektor Haar: kotak wajah, label, mata dan senyum"""
+
+    def __init__(self, labels):
+        self.labels = labels
+
+    def draw(self, frame, faces):
+        """Gambar semua wajah; kembalikan (frame, label ekspresi wajah pertama)"""
+        for face in faces:
+            x, y, x_max, y_max = face.bbox
+
+            # Gambar rectangle untuk wajah
+            cv2.rectangle(frame, (x, y), (x_max, y_max), (0, 255, 0), 2)
+
+            # Label ekspresi dengan background
+            draw_label(frame, f'Ekspresi: {self.labels[face.code]}', (x, y - 35), (x + 5, y - 15), box_height=30)
+
+            # Gambar mata
+            for (ex, ey, ew, eh) in face.parts['eyes']:
+                cv2.rectangle(frame, (x+ex, y+ey), (x+ex+ew, y+ey+eh), (255, 0, 0), 2)
+
+            # Gambar senyum
+            for (sx, sy, sw, sh) in face.parts['smiles']:
+                cv2.rectangle(frame, (x+sx, y+sy), (x+sx+sw, y+sy+sh), (0, 0, 255), 2)
+
+        if not faces:
+            return frame, NO_FACE_LABEL
+        return frame, self.labels[faces[0].code]
@@ -0,0 +1,70 @@
+"""
+Penulisan hasil deteksi secara streaming ke file JSONL atau CSV
+"""
+import csv
+import json
+
+from config import EXPRESSION_LABELS
+from landmark_features import FEATURE_NAMES
+
+FACE_FIELDS = ['face', 'x_min', 'y_min', 'x_max', 'y_max', 'expression', 'code', 'margin'] + FEATURE_NAMES
+
+
+def face_record(face):
+    """Ubah FaceResult menjadi dict yang bisa diserialisasi"""
+    features = face.features
+    margin = face.margin
+    return {
+        'bbox': [int(v) for v in face.bbox],
+        'expression': face.label,
+        'code': int(face.code),
+        'margin': None if margin is None else round(margin, 6),
+        'features': None if features is None else [round(float(v), 6) for v in features]
+    }
+
+
+class ResultWriter:
+    """Tulis satu record per frame/gambar (JSONL) atau satu baris per wajah (CSV)"""
+
+    def __init__(self, path, fmt=None):
+        if fmt is None:
+            fmt = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+        if fmt not in ('jsonl', 'csv'):
+            raise ValueError(f"Format output tidak dikenal: {fmt} (pilihan: jsonl, csv)")
+
+        self.format = fmt
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.csv_writer = None
+        self.records = 0
+
+    def write(self, faces, **fields):
+        """Tulis hasil satu frame; `fields` berisi kolom kunci seperti frame/timestamp/path"""
+        if self.format == 'jsonl':
+            record = dict(fields)
+            record['faces'] = [face_record(face) for face in faces]
+            self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        else:
+            if self.csv_writer is None:
+                self.csv_writer = csv.writer(self.file)
+                self.csv_writer.writerow(list(fields) + FACE_FIELDS)
+
+            keys = list(fields.values())
+            if not faces:
+                self.csv_writer.writerow(keys + ['', '', '', '', '', EXPRESSION_LABELS['NO_FACE'], '', '']
+                                         + [''] * len(FEATURE_NAMES))
+            for i, face in enumerate(faces):
+                record = face_record(face)
+                features = record['features'] or [''] * len(FEATURE_NAMES)
+                margin = '' if record['margin'] is None else record['margin']
+                self.csv_writer.writerow(keys + [i] + record['bbox']
+                                         + [record['expression'], record['code'], margin] + features)
+        self.records += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
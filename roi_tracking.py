@@ -0,0 +1,69 @@
+"""
+Tracking ROI wajah: FaceMesh dijalankan pada crop di sekitar bounding box frame
+sebelumnya, lalu landmark dipetakan kembali ke koordinat frame penuh
+"""
+from config import ROI_TRACKING_CONFIG
+
+
+class RoiTracker:
+    """Simpan bounding box terakhir dan hitung region crop untuk frame berikutnya"""
+
+    def __init__(self, padding=None, resize_tolerance=None, max_input_size=None, max_area_ratio=None):
+        config = ROI_TRACKING_CONFIG
+        self.padding = config['padding'] if padding is None else padding
+        self.resize_tolerance = config['resize_tolerance'] if resize_tolerance is None else resize_tolerance
+        self.max_input_size = max_input_size or config['max_input_size']
+        self.max_area_ratio = max_area_ratio or config['max_area_ratio']
+        self.last_bbox = None
+        self.side = None
+        self.hits = 0
+        self.misses = 0
+
+    def region(self, width, height):
+        """Region crop (x0, y0, x1, y1) untuk frame ini, atau None untuk frame penuh"""
+        if self.last_bbox is None:
+            return None
+
+        x_min, y_min, x_max, y_max = self.last_bbox
+        face_size = max(x_max - x_min, y_max - y_min)
+
+        # Ukuran crop hanya diubah jika ukuran wajah berubah cukup jauh, supaya skala
+        # wajah di dalam crop tetap stabil untuk tracking internal FaceMesh
+        target = face_size * (1 + 2 * self.padding)
+        if self.side is None or abs(target - self.side) > self.resize_tolerance * self.side:
+            self.side = target
+
+        side = int(self.side)
+        if side >= min(width, height) or side * side > self.max_area_ratio * width * height:
+            return None
+
+        # Crop mengikuti pusat wajah; di tepi frame crop digeser, bukan diperkecil
+        cx = (x_min + x_max) // 2
+        cy = (y_min + y_max) // 2
+        x0 = min(max(0, cx - side // 2), width - side)
+        y0 = min(max(0, cy - side // 2), height - side)
+        return (x0, y0, x0 + side, y0 + side)
+
+    def update(self, bbox):
+        """Catat bounding box wajah terbaru (None jika wajah hilang)"""
+        self.last_bbox = bbox
+        if bbox is None:
+            self.side = None
+
+    def input_scale(self, region):
+        """Skala untuk memperkecil crop sampai sisi terpanjangnya max_input_size"""
+        x0, y0, x1, y1 = region
+        return min(1.0, self.max_input_size / max(x1 - x0, y1 - y0))
+
+
+def to_frame_coords(points, region, width, height):
+    """Petakan landmark ternormalisasi crop (..., n, 2|3) ke ternormalisasi frame penuh (in-place)"""
+    x0, y0, x1, y1 = region
+    crop_w = x1 - x0
+    points[..., 0] *= crop_w / width
+    points[..., 0] += x0 / width
+    points[..., 1] *= (y1 - y0) / height
+    points[..., 1] += y0 / height
+    if points.shape[-1] > 2:
+        points[..., 2] *= crop_w / width
+    return points
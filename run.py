@@ -0,0 +1,218 @@
+"""
+Entry point non-interaktif untuk semua mode dan backend
+
+Hanya modul backend yang dipilih yang diimport (Haar tidak mengimport
+MediaPipe), dan detektor dibangun dari pengaturan di config.py.
+
+Contoh:
+    python run.py --backend haar image foto.jpg -o hasil.png
+    python run.py --backend mediapipe video rekaman.mp4 -o hasil.jsonl
+    python run.py --backend haar images foto/ -o label.csv --workers 8
+    python run.py webcam --threaded
+    python run.py --timing --backend mediapipe image foto.jpg
+    python run.py --cache .landmark_cache images foto/ -o label.jsonl
+    python run.py --backend haar streams a.mp4 b.mp4 0 --realtime -o hasil.jsonl
+"""
+import time
+
+_START = time.perf_counter()
+
+import argparse
+
+from backends import BACKENDS, create_detector
+from config import DEFAULT_BACKEND
+
+
+def detector_options(args, static=False):
+    """Opsi konstruktor dari argumen CLI (selebihnya dari config.py)"""
+    if args.backend == 'haar':
+        return {}
+    options = {}
+    if static:
+        options['static_image_mode'] = True
+    if args.max_faces:
+        options['max_num_faces'] = args.max_faces
+    if args.tracking and not static:
+        options['tracking'] = True
+    if static and args.cache:
+        from landmark_cache import LandmarkCache
+        options['cache'] = LandmarkCache(args.cache)
+    return options
+
+
+def check_detector_arguments(parser, args):
+    if args.backend == 'haar' and (args.tracking or args.max_faces or args.cache):
+        parser.error("--tracking, --max-faces dan --cache hanya untuk backend MediaPipe")
+    if args.tracking and args.max_faces and args.max_faces > 1:
+        parser.error("--tracking hanya mendukung satu wajah")
+
+
+def build_detector(args, static=False):
+    timings = {}
+    detector = create_detector(args.backend, timings, **detector_options(args, static))
+    if args.timing:
+        print(f"Startup: import backend {timings['import_seconds']:.3f} s, "
+              f"inisialisasi {timings['init_seconds']:.3f} s, "
+              f"total sejak start {time.perf_counter() - _START:.3f} s")
+    return detector
+
+
+def run_webcam(args):
+    detector = build_detector(args)
+    source = int(args.source) if args.source.isdigit() else args.source
+    options = {'threaded': args.threaded, 'overlay': args.overlay or None}
+    if args.adaptive:
+        options['adaptive'] = True
+    if args.motion_gate:
+        options['motion_gate'] = True
+    detector.run_webcam(source, **options)
+
+
+def run_image(args):
+    import cv2
+
+    detector = build_detector(args, static=True)
+    image = cv2.imread(args.image)
+    if image is None:
+        raise SystemExit(f"Error: Tidak dapat membaca gambar {args.image}")
+
+    faces = detector.detect(image)
+    if not faces:
+        print("Tidak Ada Wajah")
+    for i, face in enumerate(faces):
+        margin = '' if face.margin is None else f" (margin {face.margin:.4f})"
+        print(f"Wajah {i + 1}: {face.label}{margin}, bbox {face.bbox}")
+
+    if args.output:
+        annotated, _ = detector.draw_results(image, faces)
+        cv2.imwrite(args.output, annotated)
+        print(f"Hasil disimpan ke {args.output}")
+
+
+def add_video_arguments(parser):
+    """Opsi mode video, dipakai juga oleh video_processing.py"""
+    parser.add_argument('video', help="Path file video")
+    parser.add_argument('-o', '--output', required=True, help="File hasil (.jsonl atau .csv)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help="Format output (default: dari ekstensi)")
+    parser.add_argument('--stride', type=int, default=1, help="Proses setiap frame ke-N")
+    parser.add_argument('--max-frames', type=int, help="Batas jumlah frame yang diproses")
+    parser.add_argument('--annotate', metavar='VIDEO', help="Tulis video beranotasi (.mp4/.avi)")
+    parser.add_argument('--segments', action='store_true',
+                        help="Dengan --annotate: hanya segmen di sekitar perubahan ekspresi")
+    parser.add_argument('--prometheus', help="Tulis metrik per tahap ke file teks Prometheus")
+    parser.add_argument('--metrics-log', help="Tambahkan ringkasan metrik berkala ke file JSONL")
+    parser.add_argument('--metrics-interval', type=float, default=5.0,
+                        help="Interval penulisan metrik (detik)")
+
+
+def check_video_arguments(parser, args):
+    if args.stride < 1:
+        parser.error("--stride harus >= 1")
+    if args.segments and not args.annotate:
+        parser.error("--segments membutuhkan --annotate")
+
+
+def run_video(args):
+    import video_processing
+
+    video_processing.run(args, build_detector(args))
+
+
+def run_images(args):
+    from batch_images import collect_images, process_images
+
+    paths = collect_images(args.input)
+    if not paths:
+        raise SystemExit(f"Error: Tidak ada gambar ditemukan di {args.input}")
+    if args.timing:
+        print(f"Startup: {time.perf_counter() - _START:.3f} s (detektor dibuat di setiap worker)")
+
+    print(f"Memproses {len(paths)} gambar dengan backend {args.backend}...")
+    stats = process_images(paths, args.output, args.backend, args.workers,
+                           args.format, args.chunksize, args.max_faces, args.cache)
+    print(f"Selesai: {stats['images']} gambar dalam {stats['seconds']:.2f} s "
+          f"({stats['images_per_second']:.1f} gambar/s, {stats['unreadable']} tidak terbaca) "
+          f"-> {args.output}")
+
+
+def run_streams(args):
+    from multi_stream import MultiStreamRunner, run_streams
+
+    options = detector_options(args)
+    options.pop('tracking', None)
+    runner = MultiStreamRunner(args.sources, args.backend, args.workers, args.queue_size,
+                               args.realtime, args.max_frames, args.motion_gate, **options)
+    run_streams(runner, args.output, args.format)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deteksi wajah dan ekspresi (semua mode)")
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument('--max-faces', type=int,
+                        help="MediaPipe: jumlah wajah maksimum (default: MEDIAPIPE_CONFIG)")
+    parser.add_argument('--tracking', action='store_true',
+                        help="MediaPipe: proses crop di sekitar wajah frame sebelumnya")
+    parser.add_argument('--timing', action='store_true',
+                        help="Tampilkan waktu import dan inisialisasi backend")
+    parser.add_argument('--cache', metavar='DIR',
+                        help="MediaPipe, mode image/images: cache landmark per isi gambar")
+    parser.add_argument('--motion-gate', action='store_true',
+                        help="Mode webcam/video/streams: lewati inferensi pada frame yang tidak berubah")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    webcam = commands.add_parser('webcam', help="Deteksi real-time dari webcam")
+    webcam.add_argument('--source', default='0', help="Index webcam atau URL/file stream")
+    webcam.add_argument('--threaded', action='store_true', help="Pipeline multi-thread")
+    webcam.add_argument('--adaptive', action='store_true', help="Kualitas adaptif (MediaPipe)")
+    webcam.add_argument('--overlay', action='store_true', help="Tampilkan FPS/latensi")
+    webcam.set_defaults(handler=run_webcam)
+
+    image = commands.add_parser('image', help="Deteksi pada satu gambar")
+    image.add_argument('image', help="Path gambar")
+    image.add_argument('-o', '--output', help="Simpan gambar beranotasi ke file ini")
+    image.set_defaults(handler=run_image)
+
+    video = commands.add_parser('video', help="Proses file video tanpa GUI")
+    # Opsi dan loop frame dipakai bersama dengan video_processing.py
+    add_video_arguments(video)
+    video.set_defaults(handler=run_video)
+
+    images = commands.add_parser('images', help="Proses banyak gambar secara paralel")
+    images.add_argument('input', help="Direktori gambar atau pola glob")
+    images.add_argument('-o', '--output', required=True, help="File hasil (.jsonl atau .csv)")
+    images.add_argument('--format', choices=['jsonl', 'csv'], help="Format output (default: dari ekstensi)")
+    images.add_argument('--workers', type=int, help="Jumlah proses worker (default: jumlah CPU)")
+    images.add_argument('--chunksize', type=int, default=16, help="Jumlah gambar per tugas worker")
+    images.set_defaults(handler=run_images)
+
+    streams = commands.add_parser('streams', help="Proses banyak sumber video sekaligus (asyncio)")
+    streams.add_argument('sources', nargs='+', help="File video, index webcam atau URL stream")
+    streams.add_argument('-o', '--output', help="File hasil semua stream (.jsonl atau .csv)")
+    streams.add_argument('--format', choices=['jsonl', 'csv'], help="Format output (default: dari ekstensi)")
+    streams.add_argument('--workers', type=int, default=2, help="Jumlah instance detektor bersama")
+    streams.add_argument('--queue-size', type=int, default=2, help="Ukuran queue frame/hasil per stream")
+    streams.add_argument('--realtime', action='store_true', help="Putar file video sesuai frame rate aslinya")
+    streams.add_argument('--max-frames', type=int, help="Batas frame per stream")
+    streams.set_defaults(handler=run_streams)
+
+    args = parser.parse_args()
+
+    check_detector_arguments(parser, args)
+    if args.cache and args.command not in ('image', 'images'):
+        parser.error("--cache hanya untuk mode image dan images")
+    if args.motion_gate and args.command not in ('webcam', 'video', 'streams'):
+        parser.error("--motion-gate hanya untuk mode webcam, video dan streams")
+    if args.command == 'webcam' and args.adaptive and args.motion_gate:
+        parser.error("--adaptive dan --motion-gate tidak bisa dipakai bersamaan")
+    if args.command == 'webcam' and args.adaptive and args.backend == 'haar':
+        parser.error("--adaptive hanya untuk backend MediaPipe")
+    if args.command == 'streams' and args.tracking:
+        parser.error("--tracking tidak didukung mode streams (detektor dipakai bersama)")
+    if args.command == 'video':
+        check_video_arguments(parser, args)
+
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Soak test: jalankan detektor sangat lama dan pantau memori serta throughput
+
+Detektor memproses frame video (atau video sintetis) yang diputar berulang
+sampai jumlah frame tercapai. Setelah warm-up diambil baseline, lalu setiap
+`sample_interval` frame dicatat RSS proses, memori Python yang dilacak
+tracemalloc dan FPS interval tersebut. Di akhir, snapshot tracemalloc
+dibandingkan dengan baseline untuk menampilkan lokasi alokasi dengan
+pertumbuhan terbesar.
+
+RSS mencakup memori native (graph MediaPipe, cascade OpenCV, buffer numpy),
+sedangkan tracemalloc hanya melihat alokasi lewat allocator Python/numpy
+tetapi bisa menunjuk baris kodenya. Run dinyatakan gagal (exit code 1) jika
+pertumbuhan melewati batas di SOAK_CONFIG.
+
+Contoh:
+    python soak.py --backend mediapipe --frames 1000000 --video rekaman.mp4 -o soak.json
+    python soak.py --backend haar --frames 20000 --sample-interval 500
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from backends import BACKENDS, create_detector
+from benchmark import load_frames, peak_rss_mb, synthetic_frames
+from config import DEFAULT_BACKEND, SOAK_CONFIG
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError):  # Windows
+    _PAGE_SIZE = None
+
+# Alokasi milik tracemalloc, mesin import dan sampel soak test sendiri tidak relevan untuk laporan
+_SITE_FILTERS = (
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>')
+)
+
+
+def current_rss_mb():
+    """RSS proses ini saat ini (MB) dari /proc; peak RSS jika /proc tidak tersedia"""
+    if _PAGE_SIZE is not None:
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+        except OSError:
+            pass
+    # macOS: hanya peak yang tersedia, pertumbuhan tetap terlihat tetapi tidak pernah turun
+    return peak_rss_mb()
+
+
+def growth_sites(baseline, snapshot, limit):
+    """Lokasi (file:baris) dengan pertumbuhan memori terbesar sejak baseline"""
+    stats = snapshot.filter_traces(_SITE_FILTERS).compare_to(baseline.filter_traces(_SITE_FILTERS), 'lineno')
+    sites = []
+    for stat in stats:
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        sites.append({
+            'site': f'{frame.filename}:{frame.lineno}',
+            'growth_kb': round(stat.size_diff / 1024, 1),
+            'count_diff': stat.count_diff,
+            'size_kb': round(stat.size / 1024, 1)
+        })
+        if len(sites) >= limit:
+            break
+    return sites
+
+
+def fps_drift(samples):
+    """Perubahan relatif FPS seperempat sampel terakhir terhadap seperempat pertama"""
+    fps = [sample['fps'] for sample in samples]
+    if len(fps) < 2:
+        return None
+    quarter = max(1, len(fps) // 4)
+    start = float(np.mean(fps[:quarter]))
+    end = float(np.mean(fps[-quarter:]))
+    return (end - start) / start if start > 0 else None
+
+
+def memory_slope(samples, key):
+    """Kemiringan regresi linear memori (MB per 10000 frame); None jika sampel kurang"""
+    points = [(sample['frame'], sample[key]) for sample in samples if sample[key] is not None]
+    if len(points) < 3:
+        return None
+    frames, values = np.array(points, dtype=np.float64).T
+    return float(np.polyfit(frames, values, 1)[0] * 10000)
+
+
+def run_soak(detector, frames, total_frames=None, warmup_frames=None, sample_interval=None,
+             traceback_depth=None, top_sites=None, trace=True, on_sample=None):
+    """Putar `frames` berulang lewat detector.process_frame dan kumpulkan sampel memori/FPS"""
+    config = SOAK_CONFIG
+    total_frames = total_frames or config['frames']
+    warmup_frames = config['warmup_frames'] if warmup_frames is None else warmup_frames
+    sample_interval = sample_interval or config['sample_interval']
+    top_sites = config['top_sites'] if top_sites is None else top_sites
+
+    # Frame disalin ke satu buffer karena process_frame menggambar in-place;
+    # salinan baru per frame akan ikut mengaburkan pengukuran alokasi
+    buffer = np.empty_like(frames[0])
+    loop = len(frames)
+
+    def process(index):
+        frame = frames[index % loop]
+        if frame.shape != buffer.shape:
+            detector.process_frame(frame.copy())
+        else:
+            np.copyto(buffer, frame)
+            detector.process_frame(buffer)
+
+    for index in range(warmup_frames):
+        process(index)
+
+    if trace:
+        tracemalloc.start(traceback_depth or config['traceback_depth'])
+    try:
+        gc.collect()
+        baseline_rss = current_rss_mb()
+        baseline = tracemalloc.take_snapshot() if trace else None
+        baseline_traced = tracemalloc.get_traced_memory()[0] / (1024 * 1024) if trace else None
+
+        samples = []
+        start = interval_start = time.perf_counter()
+        for index in range(total_frames):
+            process(warmup_frames + index)
+            done = index + 1
+            if done % sample_interval and done != total_frames:
+                continue
+
+            now = time.perf_counter()
+            interval_frames = done - (samples[-1]['frame'] if samples else 0)
+            fps = interval_frames / (now - interval_start) if now > interval_start else 0.0
+            gc.collect()
+            traced = tracemalloc.get_traced_memory()[0] / (1024 * 1024) if trace else None
+            sample = {
+                'frame': done,
+                'elapsed_s': round(now - start, 3),
+                'fps': round(fps, 2),
+                'rss_mb': current_rss_mb(),
+                'traced_mb': traced
+            }
+            samples.append(sample)
+            if on_sample is not None:
+                on_sample(sample)
+            # Waktu sampling (gc, tracemalloc) tidak dihitung ke interval berikutnya
+            interval_start = time.perf_counter()
+
+        sites = growth_sites(baseline, tracemalloc.take_snapshot(), top_sites) if trace else []
+        elapsed = time.perf_counter() - start
+    finally:
+        if trace:
+            tracemalloc.stop()
+
+    last = samples[-1]
+    return {
+        'frames': total_frames,
+        'seconds': round(elapsed, 3),
+        'fps': round(total_frames / elapsed, 2) if elapsed > 0 else 0.0,
+        'baseline_rss_mb': baseline_rss,
+        'rss_growth_mb': last['rss_mb'] - baseline_rss if baseline_rss is not None else None,
+        'rss_slope_mb_per_10k': memory_slope(samples, 'rss_mb'),
+        'baseline_traced_mb': baseline_traced,
+        'traced_growth_mb': last['traced_mb'] - baseline_traced if trace else None,
+        'traced_slope_mb_per_10k': memory_slope(samples, 'traced_mb') if trace else None,
+        'fps_drift': fps_drift(samples),
+        'top_growth_sites': sites,
+        'samples': samples
+    }
+
+
+def check_limits(report, max_rss_growth_mb=None, max_traced_growth_mb=None, max_fps_drop=None):
+    """Daftar pelanggaran batas (kosong jika lolos)"""
+    config = SOAK_CONFIG
+    max_rss_growth_mb = config['max_rss_growth_mb'] if max_rss_growth_mb is None else max_rss_growth_mb
+    max_traced_growth_mb = config['max_traced_growth_mb'] if max_traced_growth_mb is None else max_traced_growth_mb
+    max_fps_drop = config['max_fps_drop'] if max_fps_drop is None else max_fps_drop
+
+    failures = []
+    rss = report['rss_growth_mb']
+    if rss is not None and rss > max_rss_growth_mb:
+        failures.append(f"RSS tumbuh {rss:.1f} MB (batas {max_rss_growth_mb} MB)")
+    traced = report['traced_growth_mb']
+    if traced is not None and traced > max_traced_growth_mb:
+        failures.append(f"Memori Python tumbuh {traced:.2f} MB (batas {max_traced_growth_mb} MB)")
+    drift = report['fps_drift']
+    if max_fps_drop is not None and drift is not None and -drift > max_fps_drop:
+        failures.append(f"FPS turun {-drift:.1%} (batas {max_fps_drop:.0%})")
+    return failures
+
+
+def print_sample(sample):
+    traced = '-' if sample['traced_mb'] is None else f"{sample['traced_mb']:.2f}"
+    rss = '-' if sample['rss_mb'] is None else f"{sample['rss_mb']:.1f}"
+    print(f"  frame {sample['frame']:>9}  {sample['elapsed_s']:>9.1f} s  {sample['fps']:>8.1f} FPS  "
+          f"RSS {rss:>8} MB  traced {traced:>7} MB", flush=True)
+
+
+def print_report(report, failures):
+    def mb(value, digits=1):
+        return '-' if value is None else f"{value:+.{digits}f} MB"
+
+    print(f"\nSelesai: {report['frames']} frame dalam {report['seconds']:.1f} s ({report['fps']:.1f} FPS)")
+    print(f"  RSS: {mb(report['rss_growth_mb'])} sejak baseline "
+          f"(tren {mb(report['rss_slope_mb_per_10k'], 2)} / 10k frame)")
+    print(f"  tracemalloc: {mb(report['traced_growth_mb'], 2)} sejak baseline "
+          f"(tren {mb(report['traced_slope_mb_per_10k'], 3)} / 10k frame)")
+    drift = report['fps_drift']
+    print(f"  Drift FPS (akhir vs awal): {'-' if drift is None else f'{drift:+.1%}'}")
+    if report['top_growth_sites']:
+        print("  Pertumbuhan alokasi terbesar:")
+        for site in report['top_growth_sites']:
+            print(f"    {site['growth_kb']:>10.1f} KB  {site['count_diff']:>+8} blok  {site['site']}")
+    if failures:
+        print("GAGAL:")
+        for failure in failures:
+            print(f"  - {failure}")
+    else:
+        print("LOLOS: memori dan throughput stabil")
+
+
+def main():
+    config = SOAK_CONFIG
+    parser = argparse.ArgumentParser(description="Soak test memori dan throughput detektor")
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument('--video', help="Video yang diputar berulang (default: video sintetis)")
+    parser.add_argument('--frames', type=int, default=config['frames'], help="Total frame yang diproses")
+    parser.add_argument('--warmup', type=int, default=config['warmup_frames'],
+                        help="Frame sebelum baseline memori")
+    parser.add_argument('--sample-interval', type=int, default=config['sample_interval'],
+                        help="Ambil sampel memori/FPS setiap N frame")
+    parser.add_argument('--loop-frames', type=int, default=config['loop_frames'],
+                        help="Jumlah frame yang didecode lalu diputar berulang")
+    parser.add_argument('--tracking', action='store_true', help="MediaPipe: ROI tracking")
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help="Hanya RSS (tanpa overhead tracemalloc)")
+    parser.add_argument('--max-rss-growth', type=float, help="Batas pertumbuhan RSS (MB)")
+    parser.add_argument('--max-traced-growth', type=float, help="Batas pertumbuhan tracemalloc (MB)")
+    parser.add_argument('--max-fps-drop', type=float, help="Batas penurunan FPS akhir vs awal (rasio)")
+    parser.add_argument('-o', '--output', help="Simpan laporan JSON (termasuk semua sampel)")
+    args = parser.parse_args()
+
+    if args.frames < 1 or args.sample_interval < 1 or args.loop_frames < 1:
+        parser.error("--frames, --sample-interval dan --loop-frames harus >= 1")
+    if args.backend == 'haar' and args.tracking:
+        parser.error("--tracking hanya untuk backend MediaPipe")
+
+    frames = load_frames(args.video, args.loop_frames) if args.video else synthetic_frames(args.loop_frames)
+    if not frames:
+        raise SystemExit(f"Error: Video {args.video} tidak berisi frame")
+    options = {'tracking': True} if args.tracking else {}
+    detector = create_detector(args.backend, **options)
+
+    print(f"Soak test {args.backend}: {args.frames} frame "
+          f"({len(frames)} frame {args.video or 'sintetis'} diulang), sampel setiap {args.sample_interval}")
+    report = run_soak(detector, frames, args.frames, args.warmup, args.sample_interval,
+                      trace=not args.no_tracemalloc, on_sample=print_sample)
+    failures = check_limits(report, args.max_rss_growth, args.max_traced_growth, args.max_fps_drop)
+    print_report(report, failures)
+
+    if args.output:
+        report = dict(report, backend=args.backend, video=args.video or 'synthetic', failures=failures)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Laporan disimpan ke {args.output}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
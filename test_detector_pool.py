@@ -0,0 +1,44 @@
+"""
+Test penggantian instance tidak sehat pada detector_pool.py
+"""
+import time
+
+from detector_pool import DetectorPool
+
+
+def test_unhealthy_instance_replaced_off_request_path_and_closed():
+    pool = DetectorPool('haar', size=1, warmup_frames=0, max_failures=1)
+    create = pool._create
+
+    def slow_create():
+        time.sleep(0.3)
+        return create()
+    pool._create = slow_create
+
+    old = pool.acquire()
+    closed = []
+    old.close = lambda: closed.append(True)
+
+    start = time.perf_counter()
+    pool.release(old, failed=True)
+    assert time.perf_counter() - start < 0.1
+
+    replacement = pool.acquire(timeout=5)
+    assert replacement is not old
+    assert closed == [True]
+    stats = pool.stats()
+    assert stats['replaced'] == 1 and stats['replacing'] == 0
+    assert len(stats['instances']) == 1
+
+
+def test_failed_replacement_keeps_old_instance():
+    pool = DetectorPool('haar', size=1, warmup_frames=0, max_failures=1)
+
+    def broken_create():
+        raise IOError("model tidak ada")
+    pool._create = broken_create
+
+    old = pool.acquire()
+    pool.release(old, failed=True)
+    assert pool.acquire(timeout=5) is old
+    assert pool.stats()['replace_failures'] == 1
@@ -0,0 +1,39 @@
+"""
+Test decode_image dan handler POST /detect pada inference_server.py
+"""
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import numpy as np
+import pytest
+
+from inference_server import InferenceService, create_server, decode_image
+
+
+def test_decode_raw_frame():
+    body = np.arange(4 * 2 * 3, dtype=np.uint8).tobytes()
+    image = decode_image(body, {'width': ['4'], 'height': ['2']})
+    assert image.shape == (2, 4, 3)
+
+
+@pytest.mark.parametrize('query', [{'width': ['64']}, {'height': ['64']}])
+def test_decode_raw_frame_needs_both_dimensions(query):
+    with pytest.raises(ValueError, match="width dan height wajib diisi"):
+        decode_image(b'\x00' * 64 * 64 * 3, query)
+
+
+def test_post_with_one_dimension_returns_400():
+    server = create_server(InferenceService('haar', workers=1), '127.0.0.1', 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        port = server.server_address[1]
+        with pytest.raises(HTTPError) as error:
+            urlopen(f'http://127.0.0.1:{port}/detect?width=64', data=b'\x00' * 64 * 64 * 3, timeout=10)
+        assert error.value.code == 400
+        assert json.loads(error.value.read())['error'] == "width dan height wajib diisi"
+    finally:
+        server.shutdown()
+        server.server_close()
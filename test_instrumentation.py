@@ -0,0 +1,24 @@
+"""
+Test penutupan sink metrik pada instrumentation.py
+"""
+import json
+
+from instrumentation import create_metrics
+
+
+def test_close_writes_last_interval_and_closes_log(tmp_path):
+    log_path = tmp_path / 'metrik.jsonl'
+    prom_path = tmp_path / 'metrik.prom'
+    metrics = create_metrics(str(prom_path), str(log_path), interval=3600)
+    with metrics.stage('mesh'):
+        pass
+    metrics.count_frame(1)
+    metrics.close()
+
+    json_sink = metrics.sinks[1]
+    assert json_sink.file.closed
+    record = json.loads(log_path.read_text(encoding='utf-8'))
+    assert record['counters']['frames'] == 1
+    assert 'face_expression_frames_total 1' in prom_path.read_text(encoding='utf-8')
+    # Menutup dua kali tidak error
+    metrics.close()
@@ -0,0 +1,26 @@
+"""
+Test perhitungan ukuran disk LandmarkCache
+"""
+import numpy as np
+
+from landmark_cache import LandmarkCache
+
+POINTS = np.zeros((1, 478, 3), dtype=np.float32)
+
+
+def test_rewritten_key_counted_once(tmp_path):
+    cache = LandmarkCache(str(tmp_path), max_disk_mb=1)
+    for _ in range(20):
+        cache.put('ab' * 20, POINTS)
+    assert cache.disk_bytes == cache._disk_usage()
+
+
+def test_files_from_other_process_counted(tmp_path):
+    cache = LandmarkCache(str(tmp_path), max_disk_mb=1, rescan_interval=10)
+    other = LandmarkCache(str(tmp_path), max_disk_mb=1)
+    cache.put('00' * 20, POINTS)
+    for i in range(100):
+        other.put(f'{i + 1:040x}', POINTS)
+    for i in range(10):
+        cache.put(f'{i + 1000:040x}', POINTS)
+    assert cache.disk_bytes == cache._disk_usage()
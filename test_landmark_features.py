@@ -0,0 +1,19 @@
+"""
+Test LandmarkBuffer pada landmark_features.py
+"""
+import numpy as np
+
+from landmark_features import LandmarkBuffer
+from landmark_replay import ReplayLandmarkList
+
+
+def test_fill_all_empty_returns_empty_view():
+    buffer = LandmarkBuffer(max_faces=2)
+    assert buffer.fill_all([]).shape == (0, 478, 2)
+
+
+def test_fill_all_stacks_faces():
+    faces = [np.full((478, 3), i / 10, dtype=np.float32) for i in (1, 2)]
+    points = LandmarkBuffer(max_faces=1).fill_all([ReplayLandmarkList(face) for face in faces])
+    assert points.shape == (2, 478, 2)
+    np.testing.assert_allclose(points[:, 0, 0], [0.1, 0.2])
@@ -0,0 +1,29 @@
+"""
+Test validasi argumen MeshExpressionDetector sebelum graph Face Mesh dibuat
+"""
+import pytest
+
+from mesh_detector import MeshExpressionDetector
+
+
+class CountingFaceMesh:
+    """Pengganti FaceMesh yang hanya menghitung instance yang dibuat"""
+
+    created = 0
+
+    def __init__(self, **options):
+        CountingFaceMesh.created += 1
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize('options', [
+    {'tracking': True, 'max_num_faces': 2},
+    {'cache': object(), 'static_image_mode': False},
+])
+def test_invalid_options_build_no_face_mesh(options):
+    CountingFaceMesh.created = 0
+    with pytest.raises(ValueError):
+        MeshExpressionDetector(face_mesh_factory=CountingFaceMesh, **options)
+    assert CountingFaceMesh.created == 0
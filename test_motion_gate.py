@@ -0,0 +1,63 @@
+"""
+Test MotionGate: wajah yang bergerak tidak boleh dilewati, adegan diam boleh
+"""
+import numpy as np
+import pytest
+
+from benchmark import synthetic_frames
+from detection_result import FaceResult
+from instrumentation import NULL_TIMER, StageTimer
+from motion_gate import GatedDetector, MotionGate
+
+# Warna wajah kartun pada benchmark.synthetic_frames
+FACE_COLOR = (150, 180, 220)
+
+
+class ColorFaceDetector:
+    """Detektor palsu: bbox wajah sintetis dari warnanya"""
+
+    timer = NULL_TIMER
+
+    def __init__(self):
+        self.calls = 0
+
+    def detect(self, frame):
+        self.calls += 1
+        ys, xs = np.nonzero((frame == FACE_COLOR).all(axis=2))
+        return [FaceResult((int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max())), 0)]
+
+
+@pytest.mark.parametrize('method', ['diff', 'dhash'])
+def test_moving_face_is_not_gated(method):
+    detector = ColorFaceDetector()
+    gated = GatedDetector(detector, MotionGate(method))
+    stale = []
+    for frame in synthetic_frames(60):
+        faces = gated.detect(frame)
+        actual = detector.detect(frame)[0].bbox
+        detector.calls -= 1
+        stale.append(abs(faces[0].bbox[0] - actual[0]))
+    # Hasil yang dipakai ulang hanya boleh meleset beberapa piksel dari posisi wajah sebenarnya
+    assert max(stale) <= 3
+    assert gated.gate.skips < 15
+
+
+def test_static_scene_is_gated():
+    detector = ColorFaceDetector()
+    gated = GatedDetector(detector, MotionGate())
+    frame = synthetic_frames(1)[0]
+    for _ in range(60):
+        gated.detect(frame.copy())
+    # Hanya frame pertama dan refresh setiap refresh_interval frame yang diproses
+    assert detector.calls == 2
+
+
+def test_gate_stage_timed_once_per_frame():
+    detector = ColorFaceDetector()
+    detector.timer = StageTimer()
+    gated = GatedDetector(detector, MotionGate())
+    for frame in synthetic_frames(20):
+        gated.detect(frame)
+    samples = detector.timer.samples
+    assert len(samples['gate']) == 20
+    assert len(samples['gate_track']) == detector.calls
@@ -0,0 +1,76 @@
+"""
+Test nama stream dan backpressure hasil pada multi_stream.py
+"""
+import asyncio
+
+import cv2
+import numpy as np
+
+from multi_stream import MultiStreamRunner, Stream
+
+
+def write_video(path, frames=12):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+    writer.release()
+
+
+def test_same_source_twice_has_separate_stats(tmp_path):
+    path = tmp_path / 'a.avi'
+    write_video(path)
+    runner = MultiStreamRunner([str(path), str(path)], 'haar', workers=1)
+    stats = asyncio.run(runner.run())
+    assert list(stats) == [f'0:{path}', f'1:{path}']
+    assert all(s['counts']['inferred'] == 12 for s in stats.values())
+
+
+def test_file_results_not_dropped_when_consumer_lags(tmp_path):
+    path = tmp_path / 'a.avi'
+    write_video(path)
+
+    async def run():
+        stream = Stream(str(path), queue_size=1)
+        stream.open_queues()
+        producer = asyncio.gather(*(stream.put_result(i) for i in range(5)))
+        received = []
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            received.append(await stream.results.get())
+        await producer
+        return stream, received
+
+    stream, received = asyncio.run(run())
+    assert received == list(range(5))
+    assert stream.counts['results_dropped'] == 0
+
+
+def test_queues_created_inside_running_loop(tmp_path):
+    path = tmp_path / 'a.avi'
+    write_video(path)
+    runner = MultiStreamRunner([str(path)], 'haar', workers=1)
+    assert runner.streams[0].frames is None
+    stats = asyncio.run(runner.run())
+    assert stats[f'0:{path}']['counts']['inferred'] == 12
+
+
+def test_unopenable_source_fails_only_its_stream(tmp_path):
+    path = tmp_path / 'a.avi'
+    write_video(path)
+    runner = MultiStreamRunner([str(tmp_path / 'tidak_ada.avi'), str(path)], 'haar', workers=1)
+    stats = list(asyncio.run(runner.run()).values())
+    assert stats[0]['error'] is not None
+    assert stats[1]['error'] is None and stats[1]['counts']['inferred'] == 12
+
+
+def test_live_results_drop_oldest():
+    async def run():
+        stream = Stream('rtsp://kamera', queue_size=1)
+        stream.open_queues()
+        for i in range(3):
+            await stream.put_result(i)
+        return stream, stream.results.get_nowait()
+
+    stream, latest = asyncio.run(run())
+    assert latest == 2
+    assert stream.counts['results_dropped'] == 2
@@ -0,0 +1,51 @@
+"""
+Test backpressure dan penanda akhir pada pipeline.py
+"""
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from pipeline import _END, DropOldestQueue, run_pipeline
+
+
+def write_video(path, frames=30):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (64, 48))
+    for i in range(frames):
+        writer.write(np.full((48, 64, 3), i * 8, dtype=np.uint8))
+    writer.release()
+
+
+def slow_process(frame):
+    time.sleep(0.005)
+    return frame, None
+
+
+def test_file_source_keeps_every_frame(tmp_path):
+    path = tmp_path / 'a.avi'
+    write_video(path)
+    stats = run_pipeline(str(path), slow_process, lambda frame, expression: True)
+    assert stats['counts'] == {'captured': 30, 'inferred': 30, 'rendered': 30}
+    assert stats['frame_queue']['dropped'] == 0
+    assert stats['result_queue']['dropped'] == 0
+
+
+def test_live_source_drops_oldest(tmp_path):
+    path = tmp_path / 'a.avi'
+    write_video(path)
+    stats = run_pipeline(str(path), slow_process, lambda frame, expression: True, live=True)
+    assert stats['counts']['captured'] == 30
+    assert stats['frame_queue']['dropped'] > 0
+
+
+def test_end_marker_does_not_evict_last_item():
+    q = DropOldestQueue(1)
+    q.put('terakhir')
+    stop_event = threading.Event()
+    thread = threading.Thread(target=q.put_wait, args=(_END, stop_event))
+    thread.start()
+    assert q.get(timeout=1) == 'terakhir'
+    thread.join(timeout=1)
+    assert q.get(timeout=1) is _END
+    assert q.dropped == 0
@@ -0,0 +1,27 @@
+"""
+Test tabel koneksi Face Mesh statis dan MeshRenderer pada rendering.py
+"""
+import numpy as np
+import pytest
+
+import face_mesh_connections
+from rendering import MeshRenderer, connection_groups
+
+
+def test_tables_match_mediapipe_default_styles():
+    styles = pytest.importorskip('mediapipe.python.solutions.drawing_styles')
+    for name, style in (('contours', styles.get_default_face_mesh_contours_style()),
+                        ('irises', styles.get_default_face_mesh_iris_connections_style())):
+        vendored = {}
+        for color, thickness, starts, ends in connection_groups(name):
+            for connection in zip(starts.tolist(), ends.tolist()):
+                vendored[connection] = (color, thickness)
+        assert vendored == {connection: (spec.color, spec.thickness) for connection, spec in style.items()}
+
+
+def test_mesh_renderer_draws_contours():
+    landmarks = np.random.default_rng(0).uniform(0.2, 0.8, (478, 3))
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    MeshRenderer(['Senang']).draw_landmarks(frame, landmarks)
+    for color in (face_mesh_connections.WHITE, face_mesh_connections.GREEN, face_mesh_connections.RED):
+        assert (frame == color).all(axis=2).any()
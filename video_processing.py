@@ -0,0 +1,142 @@
+"""
+Pemrosesan file video secara offline tanpa GUI
+
+Setiap frame didecode secepat mungkin, dideteksi, lalu hasilnya (index frame,
+timestamp, bounding box, ekspresi, fitur) langsung ditulis ke JSONL atau CSV.
+
+Contoh:
+    python video_processing.py rekaman.mp4 -o hasil.jsonl --backend mediapipe
+    python video_processing.py rekaman.mp4 -o hasil.jsonl --annotate beranotasi.mp4 --segments
+"""
+import argparse
+import time
+
+import cv2
+
+from backends import BACKENDS
+from config import DEFAULT_BACKEND
+from instrumentation import create_metrics
+from motion_gate import GatedDetector
+from video_writer import AnnotatedVideoWriter, expression_event
+from result_writer import ResultWriter
+
+
+def process_video(detector, video_path, output_path, fmt=None, stride=1, max_frames=None,
+                  video_writer=None):
+    """Proses seluruh video dan tulis hasil per frame; kembalikan statistik throughput
+
+    Jika `video_writer` (video_writer.AnnotatedVideoWriter) diberikan, frame
+    beranotasi juga diantrekan ke encoder latar belakang.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Tidak dapat membuka video {video_path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
+    frames = 0
+    index = 0
+    start = time.perf_counter()
+
+    try:
+        with ResultWriter(output_path, fmt) as writer:
+            while max_frames is None or frames < max_frames:
+                # Frame yang dilewati hanya di-grab (tanpa decode penuh)
+                if index % stride:
+                    if not cap.grab():
+                        break
+                    index += 1
+                    continue
+
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                if fps > 0:
+                    timestamp = index / fps
+                else:
+                    timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+                faces = detector.detect(frame)
+                writer.write(faces, frame=index, timestamp=round(timestamp, 3))
+                if video_writer is not None:
+                    annotated, _ = detector.draw_results(frame, faces)
+                    video_writer.write(annotated, expression_event(faces))
+                frames += 1
+                index += 1
+    finally:
+        cap.release()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'frames': frames,
+        'seconds': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def open_video_writer(path, video_path, stride=1, segments=False):
+    """AnnotatedVideoWriter dengan fps sumber (dibagi stride), atau None jika path kosong"""
+    if not path:
+        return None
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+    return AnnotatedVideoWriter(path, fps / stride, segments)
+
+
+def print_video_writer_stats(video_writer):
+    if video_writer is None:
+        return
+    stats = video_writer.stats()
+    target = ', '.join(video_writer.paths) or 'tidak ada segmen'
+    print(f"Video beranotasi: {stats['written']} frame ditulis, {stats['dropped']} dibuang -> {target}")
+
+
+def run(args, detector):
+    """Jalankan mode video dari argumen run.add_video_arguments() (+ args.motion_gate) dan cetak ringkasannya"""
+    detector.timer = create_metrics(args.prometheus, args.metrics_log, args.metrics_interval)
+    if args.motion_gate:
+        detector = GatedDetector(detector)
+    video_writer = open_video_writer(args.annotate, args.video, args.stride, args.segments)
+    try:
+        stats = process_video(detector, args.video, args.output, args.format,
+                              args.stride, args.max_frames, video_writer)
+    finally:
+        if video_writer is not None:
+            video_writer.close()
+        # Tulis metrik terakhir dan tutup file log metrik, juga saat pemrosesan gagal
+        if detector.timer.enabled:
+            detector.timer.close()
+
+    print(f"Selesai: {stats['frames']} frame dalam {stats['seconds']:.2f} s "
+          f"({stats['fps']:.1f} FPS) -> {args.output}")
+    print_video_writer_stats(video_writer)
+    if args.motion_gate:
+        print(f"Motion gate: {detector.gate.skips} frame dilewati ({detector.gate.skip_rate:.1%})")
+    return stats
+
+
+def main():
+    # Sama dengan `python run.py [opsi detektor] video ...`; opsi, validasi dan
+    # pembuatan detektor diambil dari run.py
+    from run import add_video_arguments, build_detector, check_detector_arguments, check_video_arguments
+
+    parser = argparse.ArgumentParser(description="Deteksi ekspresi pada file video tanpa GUI")
+    parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument('--max-faces', type=int,
+                        help="MediaPipe: jumlah wajah maksimum per frame (default: MEDIAPIPE_CONFIG)")
+    parser.add_argument('--tracking', action='store_true',
+                        help="MediaPipe: proses crop di sekitar wajah frame sebelumnya")
+    parser.add_argument('--motion-gate', action='store_true',
+                        help="Pakai ulang hasil terakhir jika frame hampir tidak berubah (MOTION_GATE_CONFIG)")
+    add_video_arguments(parser)
+    parser.set_defaults(cache=None, timing=False)
+    args = parser.parse_args()
+
+    check_detector_arguments(parser, args)
+    check_video_arguments(parser, args)
+    run(args, build_detector(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Penulisan video beranotasi di thread latar belakang
+
+Encoding cv2.VideoWriter dilakukan oleh thread sendiri di belakang queue
+terbatas, sehingga thread inferensi hanya menaruh referensi frame ke queue.
+Jika encoder tertinggal dan queue penuh, frame dibuang (dan dihitung) alih-alih
+menahan inferensi, kecuali `block=True`.
+
+Mode segmen hanya menulis potongan di sekitar perubahan ekspresi: setiap
+perubahan `event` membuka (atau memperpanjang) satu file segmen yang berisi
+`pre_seconds` sebelum perubahan sampai `post_seconds` setelah perubahan
+terakhir.
+"""
+import os
+import queue
+import threading
+from collections import deque
+
+import cv2
+
+from config import VIDEO_WRITER_CONFIG
+
+# Penanda akhir stream untuk thread encoder
+_END = object()
+
+FOURCC_BY_EXTENSION = {'.mp4': 'mp4v', '.m4v': 'mp4v', '.avi': 'MJPG', '.mkv': 'XVID'}
+
+
+def expression_event(faces):
+    """Kunci perubahan untuk mode segmen: kode ekspresi semua wajah"""
+    return tuple(sorted(int(face.code) for face in faces))
+
+
+class AnnotatedVideoWriter:
+    """Tulis frame (sudah beranotasi) ke file video dari thread terpisah"""
+
+    def __init__(self, path, fps=30.0, segments=False, queue_size=None, block=None, fourcc=None,
+                 pre_seconds=None, post_seconds=None):
+        config = VIDEO_WRITER_CONFIG
+        self.path = path
+        self.fps = fps or 30.0
+        self.segments = segments
+        self.block = config['block'] if block is None else block
+        root, ext = os.path.splitext(path)
+        self.fourcc = fourcc or config['fourcc'] or FOURCC_BY_EXTENSION.get(ext.lower(), 'mp4v')
+        pre_seconds = config['pre_seconds'] if pre_seconds is None else pre_seconds
+        post_seconds = config['post_seconds'] if post_seconds is None else post_seconds
+        self.pre_frames = max(0, round(pre_seconds * self.fps))
+        self.post_frames = max(1, round(post_seconds * self.fps))
+
+        self.queue = queue.Queue(queue_size or config['queue_size'])
+        self.counts = {'queued': 0, 'written': 0, 'dropped': 0}
+        self.paths = []
+        self.error = None
+
+        # State thread encoder
+        self.writer = None
+        self.history = deque(maxlen=self.pre_frames)
+        self.last_event = None
+        self.remaining = 0
+
+        self.thread = threading.Thread(target=self._run, name='video-writer', daemon=True)
+        self.thread.start()
+
+    def write(self, frame, event=None):
+        """Antrekan satu frame; `event` (mis. expression_event(faces)) dipakai mode segmen
+
+        Frame tidak disalin, jadi pemanggil tidak boleh mengubahnya setelah ini.
+        Mengembalikan False jika frame dibuang karena queue penuh.
+        """
+        if self.error is not None:
+            raise self.error
+        try:
+            self.queue.put((frame, event), block=self.block)
+        except queue.Full:
+            self.counts['dropped'] += 1
+            return False
+        self.counts['queued'] += 1
+        return True
+
+    def _open(self, path, frame):
+        h, w = frame.shape[:2]
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (w, h))
+        if not writer.isOpened():
+            raise IOError(f"Tidak dapat membuat video {path} (fourcc {self.fourcc})")
+        self.paths.append(path)
+        return writer
+
+    def _write_frame(self, frame):
+        self.writer.write(frame)
+        self.counts['written'] += 1
+
+    def _segment_path(self):
+        root, ext = os.path.splitext(self.path)
+        return f'{root}_{len(self.paths) + 1:03d}{ext}'
+
+    def _handle(self, frame, event):
+        if not self.segments:
+            if self.writer is None:
+                self.writer = self._open(self.path, frame)
+            self._write_frame(frame)
+            return
+
+        changed = self.last_event is not None and event != self.last_event
+        self.last_event = event
+        if changed:
+            if self.writer is None:
+                # Segmen baru diawali frame sebelum perubahan
+                self.writer = self._open(self._segment_path(), frame)
+                for previous in self.history:
+                    self._write_frame(previous)
+                self.history.clear()
+            self.remaining = self.post_frames
+
+        if self.writer is not None:
+            self._write_frame(frame)
+            self.remaining -= 1
+            if self.remaining <= 0:
+                self.writer.release()
+                self.writer = None
+        elif self.pre_frames:
+            self.history.append(frame)
+
+    def _run(self):
+        try:
+            while True:
+                item = self.queue.get()
+                if item is _END:
+                    break
+                self._handle(*item)
+        except Exception as e:
+            self.error = e
+            # Kosongkan queue agar write() yang menunggu tidak macet
+            while True:
+                try:
+                    if self.queue.get_nowait() is _END:
+                        break
+                except queue.Empty:
+                    break
+        finally:
+            if self.writer is not None:
+                self.writer.release()
+                self.writer = None
+
+    def close(self):
+        """Tunggu semua frame di queue selesai di-encode lalu tutup file"""
+        if self.thread.is_alive():
+            self.queue.put(_END)
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def stats(self):
+        return dict(self.counts, files=len(self.paths), backlog=self.queue.qsize())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()